@@ -0,0 +1,85 @@
+"""Compare converting a large overview report from a dict, from raw bytes, and projected.
+
+Intended to be executed from project root, with pyhatching installed::
+
+    python3 scripts/bench_convert.py [TARGETS] [ROUNDS]
+"""
+
+import json
+import sys
+import timeit
+
+import pyhatching
+from pyhatching import base
+
+TARGETS = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+ROUNDS = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+
+def indicator(i):
+    return {"ioc": f"10.0.{i % 255}.{i % 7}", "description": "Connects", "pid": i}
+
+
+def signature(i):
+    return {
+        "name": f"sig-{i}",
+        "score": i % 10,
+        "tags": ["family:test", "trojan"],
+        "indicators": [indicator(j) for j in range(10)],
+    }
+
+
+def target(i):
+    return {
+        "tasks": [f"behavioral{i}"],
+        "id": f"target-{i}",
+        "score": 8,
+        "submitted": "2023-01-01T00:00:00Z",
+        "sha256": "a" * 64,
+        "tags": ["family:test"],
+        "signatures": [signature(j) for j in range(20)],
+        "iocs": {"ips": [f"10.0.0.{j}" for j in range(50)]},
+    }
+
+
+REPORT = {
+    "version": "0.2.3",
+    "sample": {"id": "230101-abcdef", "sha256": "a" * 64, "size": 1024},
+    "analysis": {"score": 8, "family": ["test"], "tags": ["family:test"]},
+    "targets": [target(i) for i in range(TARGETS)],
+    "tasks": [{"sample": "230101-abcdef", "status": "reported"}] * TARGETS,
+    "signatures": [signature(i) for i in range(50)],
+}
+BODY = json.dumps(REPORT).encode()
+RESP = base.ResponseMeta(status=200, url="/samples/x/overview.json")
+
+
+def from_dict():
+    return pyhatching.convert_to_model(base.OverviewReport, RESP, json.loads(BODY))
+
+
+def from_bytes():
+    return pyhatching.convert_body(base.OverviewReport, RESP, BODY)
+
+
+PROJECTION = base.projected_model(
+    base.OverviewReport, frozenset(("analysis", "sample.sha256"))
+)
+
+
+def projected():
+    return pyhatching.convert_body(PROJECTION, RESP, BODY)
+
+
+assert from_dict().model_dump(exclude={"resp_obj"}) == from_bytes().model_dump(
+    exclude={"resp_obj"}
+)
+
+print(f"Report: {len(BODY) / 2**20:.2f} MiB, {ROUNDS} rounds")
+dict_time = min(timeit.repeat(from_dict, number=ROUNDS, repeat=3)) / ROUNDS
+bytes_time = min(timeit.repeat(from_bytes, number=ROUNDS, repeat=3)) / ROUNDS
+projected_time = min(timeit.repeat(projected, number=ROUNDS, repeat=3)) / ROUNDS
+print(f"json.loads + convert_to_model: {dict_time * 1000:.1f} ms")
+print(f"convert_body:                  {bytes_time * 1000:.1f} ms")
+print(f"convert_body (projected):      {projected_time * 1000:.1f} ms")
+print(f"Speedup: {dict_time / bytes_time:.2f}x, projected: {dict_time / projected_time:.2f}x")
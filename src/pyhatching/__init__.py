@@ -67,35 +67,93 @@ Examples:
 """
 
 
+import asyncio
+import concurrent.futures
+import dataclasses
 import functools
 import hashlib
-from json import JSONDecodeError
+import heapq
+import itertools
+import logging
 import os
 import pathlib
+import time
+from typing import Annotated, Any, AsyncIterable, AsyncIterator, BinaryIO, Callable, Iterable
 
 import aiohttp
-from pydantic import ValidationError  # pylint: disable=E0611
+from pydantic import Field, TypeAdapter, ValidationError  # pylint: disable=E0611
 
 from . import base
+from . import cache
+from . import codec
+from . import compression
+from . import enums
 from . import errors
+from . import poll
+from . import ratelimit
+from . import retry
 from . import utils
 
 
 __version__ = "0.3.1"
 """The version of pyhatching."""
 
+log = logging.getLogger(__name__)
+
 BASE_URL = "https://tria.ge"
 """The default URL for requests - the public/free version."""
 
 API_PATH = "/api/v0"
 """The base path used by all API endpoints used for requests."""
 
+CHUNK_SIZE = 2**16
+"""The default number of bytes read or written at a time when streaming files."""
+
+MAX_QUERY_LENGTH = 4096
+"""The default longest ``/search`` query built when combining hashes into one query."""
+
+
+def response_meta(
+    resp: aiohttp.ClientResponse,
+    elapsed: float | None = None,
+    keep_response: bool = False,
+) -> base.ResponseMeta:
+    """Summarize an HTTP response as a ``base.ResponseMeta``.
+
+    Parameters
+    ----------
+    resp : aiohttp.ClientResponse
+        The HTTP response.
+    elapsed : float | None, optional
+        The seconds it took to get the response, by default None.
+    keep_response : bool, optional
+        Whether to keep ``resp`` itself as the ``raw`` attribute, by default False.
+    """
+
+    try:
+        remaining = int(resp.headers["X-RateLimit-Remaining"])
+    except (KeyError, ValueError):
+        remaining = None
+
+    return base.ResponseMeta(
+        status=resp.status,
+        url=str(resp.request_info.url),
+        elapsed=elapsed,
+        rate_limit_remaining=remaining,
+        rate_limit_reset=ratelimit.parse_rate_limit_reset(
+            resp.headers.get("X-RateLimit-Reset")
+        ),
+        request_id=resp.headers.get("X-Request-Id"),
+        raw=resp if keep_response else None,
+    )
+
 
 def convert_to_model(
     model: base.HatchingResponse,
-    resp: aiohttp.ClientResponse,
+    resp: aiohttp.ClientResponse | base.ResponseMeta,
     obj: dict,
     raise_on_api_err: bool = False,
+    keep_response: bool = False,
 ) -> base.HatchingResponse | list[base.HatchingResponse]:
     """Convert an API response to the given model.
 
@@ -103,13 +161,17 @@ def convert_to_model(
     ----------
     model : base.HatchingResponse
         The model to convert the response to.
-    resp : aiohttp.ClientResponse
-        The HTTP response object so it can be added to the model.
+    resp : aiohttp.ClientResponse | base.ResponseMeta
+        The HTTP response object (or its summary) so it can be added to the model
+        as ``resp_obj``.
     obj : dict
         The already deserialized JSON data from the given response.
     raise_on_api_err : bool, optional
         Whether to raise if ``obj`` is actually an API error (``base.ErrorResponse``).
         By default False.
+    keep_response : bool, optional
+        Whether ``resp_obj`` keeps the ``aiohttp.ClientResponse`` itself,
+        by default False.
 
     Returns
     -------
@@ -127,12 +189,15 @@ def convert_to_model(
         returned by the Hatching Triage API and not a successful response.
     """
 
+    if not isinstance(resp, base.ResponseMeta):
+        resp = response_meta(resp, keep_response=keep_response)
+
     ret = []
-    url = resp.request_info.url
+    url = resp.url
     try:
         if "data" in obj:
             for item in obj["data"]:
-                ret.append(model(resp_obj=obj, **item))
+                ret.append(model(resp_obj=resp, **item))
         elif "error" in obj:
             ret = base.ErrorResponse(resp_obj=resp, **obj)
         elif isinstance(obj, dict):
@@ -148,12 +213,190 @@ def convert_to_model(
 
     if raise_on_api_err and isinstance(ret, base.ErrorResponse):
         raise errors.PyHatchingApiError(
-            f"Hatching Triage API Error - {ret.error} - {ret.message}"
+            f"Hatching Triage API Error - {ret.error} - {ret.message}", response=ret
         )
 
     return ret
 
 
+@functools.lru_cache(maxsize=None)
+def response_adapter(model: type[base.HatchingResponse]) -> TypeAdapter:
+    """Build (once per model) the adapter that validates a response body.
+
+    The body is tried as ``model`` itself, then as an ``ErrorResponse``, then as
+    a ``DataEnvelope`` of ``model`` - the first that validates wins. Trying the
+    common case first is the cheapest order, and is safe as long as ``model``
+    has required fields. Otherwise (e.g. some projections) an error body would
+    pass as ``model``, so ``ErrorResponse`` is tried first instead.
+    """
+
+    if any(field.is_required() for field in model.model_fields.values()):
+        choices = model | base.ErrorResponse | base.DataEnvelope[model]
+    else:
+        choices = base.ErrorResponse | model | base.DataEnvelope[model]
+
+    return TypeAdapter(Annotated[choices, Field(union_mode="left_to_right")])
+
+
+def convert_body(
+    model: type[base.HatchingResponse],
+    resp: aiohttp.ClientResponse | base.ResponseMeta,
+    body: bytes,
+    raise_on_api_err: bool = False,
+    keep_response: bool = False,
+) -> base.HatchingResponse | base.ResultsPage:
+    """Validate a raw API response body as the given model.
+
+    Same as ``convert_to_model``, but validates the body in a single pass
+    without deserializing it to a dict first.
+
+    Parameters
+    ----------
+    model : base.HatchingResponse
+        The model to convert the response to.
+    resp : aiohttp.ClientResponse | base.ResponseMeta
+        The HTTP response object (or its summary) so it can be added to the model
+        as ``resp_obj``. Every item of a list shares the same ``ResponseMeta``.
+    body : bytes
+        The raw JSON body of the response.
+    raise_on_api_err : bool, optional
+        Whether to raise if ``body`` is actually an API error (``base.ErrorResponse``).
+        By default False.
+    keep_response : bool, optional
+        Whether ``resp_obj`` keeps the ``aiohttp.ClientResponse`` itself,
+        by default False.
+
+    Returns
+    -------
+    base.HatchingResponse | base.ResultsPage
+        A ``ResultsPage`` of ``model`` objects if the endpoint returned a list,
+        otherwise a single ``model`` (or ``base.ErrorResponse``) object.
+
+    Raises
+    ------
+    errors.PyHatchingJsonError
+        If ``body`` is not valid JSON.
+    errors.PyHatchingRequestError
+        If ``body`` is not JSON because the request failed with a 429 or 5xx.
+    errors.PyHatchingValidateError
+        If ``body`` could not be validated as ``model``.
+    errors.PyHatchingApiError
+        If ``raise_on_api_err`` is ``True`` and ``body`` represents an error
+        returned by the Hatching Triage API and not a successful response.
+    """
+
+    if not isinstance(resp, base.ResponseMeta):
+        resp = response_meta(resp, keep_response=keep_response)
+
+    url = resp.url
+    try:
+        parsed = response_adapter(model).validate_json(body)
+    except ValidationError as err:
+        if err.errors()[0]["type"] == "json_invalid" and (
+            resp.status >= 500 or resp.status == 429
+        ):
+            # The error page of a failed request, not a response that's broken.
+            raise errors.PyHatchingRequestError(
+                f"The {url} request failed with HTTP {resp.status}"
+            ) from err
+        if err.errors()[0]["type"] == "json_invalid":
+            raise errors.PyHatchingJsonError(
+                f"Unable to parse the {url} response json: {err}"
+            ) from err
+        raise errors.PyHatchingValidateError(
+            f"Unable to validate {url} response: {err}"
+        ) from err
+
+    if isinstance(parsed, base.DataEnvelope):
+        for item in parsed.data:
+            item.resp_obj = resp
+        return base.ResultsPage(parsed.data, parsed.next)
+
+    parsed.resp_obj = resp
+
+    if raise_on_api_err and isinstance(parsed, base.ErrorResponse):
+        raise errors.PyHatchingApiError(
+            f"Hatching Triage API Error - {parsed.error} - {parsed.message}",
+            response=parsed,
+        )
+
+    return parsed
+
+
+def _convert_offloaded(
+    spec: tuple[type[base.HatchingResponse], frozenset[str] | None],
+    meta: base.ResponseMeta,
+    body: bytes,
+    raise_on_api_err: bool,
+) -> base.HatchingResponse | base.ResultsPage:
+    """Run ``convert_body`` in an executor.
+
+    The model is passed as ``(model, fields)`` since projected models can only
+    be sent to another process as the arguments to rebuild them with.
+    """
+
+    model, fields = spec
+    if fields is not None:
+        model = base.projected_model(model, fields)
+    return convert_body(model, meta, body, raise_on_api_err)
+
+
+def _failed_check(
+    err: errors.PyHatchingError, failures: int, max_failures: int
+) -> base.ErrorResponse | None:
+    """Decide what a failed status check in ``wait_for_reports`` means.
+
+    Returns the API error to yield for the sample, or None if the sample should
+    be checked again. Raises ``err`` if checking again won't help.
+    """
+
+    if isinstance(err, errors.PyHatchingApiError) and err.response is not None:
+        return err.response
+    if (
+        isinstance(err, errors.PyHatchingRequestError)
+        and not isinstance(err, errors.PyHatchingJsonError)
+        and failures < max_failures
+    ):
+        return None
+    raise err
+
+
+def _tell(fd: BinaryIO) -> int | None:
+    """The position of a file object, or None if it can't seek."""
+
+    try:
+        return fd.tell() if fd.seekable() else None
+    except (AttributeError, OSError):
+        return None
+
+
+def _range_validator(resp: aiohttp.ClientResponse) -> str | None:
+    """The ``If-Range`` value for resuming ``resp``: a strong ETag or Last-Modified."""
+
+    etag = resp.headers.get("ETag")
+    if etag is not None and not etag.startswith("W/"):
+        return etag
+    return resp.headers.get("Last-Modified")
+
+
+def _range_starts_at(resp: aiohttp.ClientResponse, offset: int) -> bool:
+    """Whether a 206 response's ``Content-Range`` starts at ``offset``."""
+
+    content_range = resp.headers.get("Content-Range", "")
+    unit, _, rest = content_range.partition(" ")
+    return unit == "bytes" and rest.split("-", 1)[0] == str(offset)
+
+
+def _task_names(sample_id: str, overview: base.OverviewReport) -> list[str]:
+    """The unique names of the tasks (e.g. ``behavioral1``) in an overview report."""
+
+    # Target task IDs are prefixed with the sample ID, e.g. <id>-behavioral1.
+    names = [task.name for task in overview.tasks or [] if task.name]
+    for target in overview.targets:
+        names.extend(t.removeprefix(f"{sample_id}-") for t in target.tasks)
+    return list(dict.fromkeys(names))
+
+
 async def new_client(
     api_key: str,
     url: str = BASE_URL,
@@ -196,10 +439,86 @@ class PyHatchingClient:
         The URL to use as a base in all requests, by default BASE_URL.
     timeout : int, optional
         The total timeout for all requests, by default 60.
+    connect_timeout : float | None, optional
+        The timeout for acquiring a connection, including from the pool,
+        by default None (only ``timeout`` applies).
+    sock_read_timeout : float | None, optional
+        The longest wait between reads of a response's data, by default None
+        (only ``timeout`` applies).
     raise_on_api_err : bool, optional
         Whether to raise when the Hatching Triage API returns an API error response
         (an HTTP 200 response that describes a handled error with the request).
         See the `API docs`_ for further information.
+    rate_limiter : ratelimit.RateLimiter | None, optional
+        The rate limiter to wait on before each request. Pass the same instance
+        to several clients to have them share one budget. By default None,
+        a new ``RateLimiter`` with no budgets (only 429 pauses) is used.
+    max_rate_limit_retries : int, optional
+        How many times a request that got an HTTP 429 is sent again once its
+        rate limit bucket is unpaused, by default 3.
+    retry_policy : retry.RetryPolicy | None, optional
+        When to retry requests that failed with a transient error, by default
+        None, a ``RetryPolicy`` with its defaults is used. Only idempotent
+        requests are retried unless the request could not be sent at all.
+    on_retry : typing.Callable | None, optional
+        Called before each retry as
+        ``on_retry(method, uri, attempt, delay, reason)`` where ``reason`` is
+        either the retried HTTP status or exception. By default None.
+    limit : int, optional
+        The maximum number of open connections, by default 100. 0 is unlimited.
+    limit_per_host : int, optional
+        The maximum number of open connections to the API host, by default 0
+        (only ``limit`` applies).
+    keepalive_timeout : float, optional
+        How long (in seconds) an idle connection is kept open, by default 15.
+    ttl_dns_cache : int | None, optional
+        How long (in seconds) resolved DNS records are cached, by default 300.
+        None caches them forever.
+    connector : aiohttp.BaseConnector | None, optional
+        An existing connector (connection pool) to use instead of creating one.
+        It is not closed by ``close``, so several clients can share it.
+        ``limit``, ``limit_per_host``, ``keepalive_timeout``, and ``ttl_dns_cache``
+        are ignored when this is set. By default None.
+    prewarm : int, optional
+        The number of connections to open to the API during ``start``, so that
+        the first burst of requests doesn't pay for as many handshakes at once.
+        By default 0.
+    sample_id_cache : cache.SampleIDCache | None, optional
+        Where hash to sample ID lookups made by ``sample_id`` are cached, by
+        default None, a ``MemorySampleIDCache`` with its defaults is used.
+        Pass the same instance to several clients to share it.
+    report_cache : cache.ReportCache | None, optional
+        Where finished overview reports are cached by sample ID, checked by
+        ``overview`` before making a request. By default None (no caching).
+    json_codec : codec.JsonCodec | None, optional
+        The JSON codec used to encode request bodies and decode responses that
+        aren't converted to models, by default None, ``codec.default_codec()``
+        picks the fastest one installed.
+    keep_response : bool, optional
+        Whether returned models keep the ``aiohttp.ClientResponse`` they were
+        built from in ``resp_obj.raw``. This keeps the response's buffers and
+        headers alive as long as the model. By default False, ``resp_obj``
+        only holds a small ``base.ResponseMeta``.
+    coalesce : bool, optional
+        Whether identical GETs made while one is already in flight wait for its
+        response instead of sending their own, by default True. Each caller
+        still builds its own model from the shared body.
+    validator_cache : cache.ValidatorCache | None, optional
+        Where GET responses with an ``ETag`` or ``Last-Modified`` are kept, so
+        repeated GETs (profiles, yara rules, sample info) are sent as conditional
+        requests and a ``304 Not Modified`` reuses the cached body. By default
+        None, a ``ValidatorCache`` with its defaults is used.
+    convert_executor : concurrent.futures.Executor | None, optional
+        Where response bodies of at least ``offload_threshold`` bytes are
+        validated, so building a large report doesn't block the event loop (and
+        every other request) while it runs. Use a ``ProcessPoolExecutor``,
+        validation holds the GIL so a ``ThreadPoolExecutor`` barely helps.
+        The model is still unpickled on this process, which is several times
+        quicker than validating it. By default None, all bodies are validated
+        on the event loop.
+    offload_threshold : int, optional
+        The smallest body, in bytes, validated in ``convert_executor``,
+        by default 1 MiB.
 
     Attributes
     ----------
@@ -211,9 +530,30 @@ class PyHatchingClient:
         The underlying ClientSession used to make requests.
     timeout : aiohttp.ClientTimeout
         The timeout object used by ``session``.
+    connector : aiohttp.BaseConnector | None
+        The connector used by ``session``, set by ``start`` if one wasn't given.
     convert_resp : typing.Callable
         A ``functools.partial`` for ``convert_to_model`` with ```raise_on_api_err``
         saved so that it doesn't have to be passed to each method call.
+    convert_body : typing.Callable
+        The same as ``convert_resp``, but for ``convert_body``.
+    rate_limiter : ratelimit.RateLimiter
+        The rate limiter every request waits on.
+    retry_policy : retry.RetryPolicy
+        The policy deciding when failed requests are retried.
+    sample_id_cache : cache.SampleIDCache
+        The cache of hash to sample ID lookups, see its ``hits`` and ``misses``.
+    report_cache : cache.ReportCache | None
+        The cache of finished overview reports, if any.
+    json_codec : codec.JsonCodec
+        The JSON codec used by the client.
+    single_flight : utils.SingleFlight | None
+        Shares identical in-flight GETs if ``coalesce`` is set, see its ``calls``
+        and ``coalesced``.
+    validator_cache : cache.ValidatorCache
+        The cache of revalidated GET responses, see its ``hits`` and ``misses``.
+    convert_executor : concurrent.futures.Executor | None
+        Where large response bodies are validated, if anywhere but the event loop.
 
     .. _API docs: https://tria.ge/docs/cloud-api/conventions/
     """
@@ -224,6 +564,27 @@ class PyHatchingClient:
         url: str = BASE_URL,
         timeout: int = 60,
         raise_on_api_err: bool = False,
+        rate_limiter: ratelimit.RateLimiter | None = None,
+        max_rate_limit_retries: int = 3,
+        retry_policy: retry.RetryPolicy | None = None,
+        on_retry: Callable[[str, str, int, float, int | BaseException], None]
+        | None = None,
+        connect_timeout: float | None = None,
+        sock_read_timeout: float | None = None,
+        limit: int = 100,
+        limit_per_host: int = 0,
+        keepalive_timeout: float = 15,
+        ttl_dns_cache: int | None = 300,
+        connector: aiohttp.BaseConnector | None = None,
+        prewarm: int = 0,
+        sample_id_cache: cache.SampleIDCache | None = None,
+        report_cache: cache.ReportCache | None = None,
+        json_codec: codec.JsonCodec | None = None,
+        keep_response: bool = False,
+        coalesce: bool = True,
+        validator_cache: cache.ValidatorCache | None = None,
+        convert_executor: concurrent.futures.Executor | None = None,
+        offload_threshold: int = 2**20,
     ) -> None:
         self.url = url
         self.api_key = api_key
@@ -232,11 +593,48 @@ class PyHatchingClient:
             "User-Agent": f"{aiohttp.http.SERVER_SOFTWARE} pyhatching/{__version__}",
         }
 
-        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.timeout = aiohttp.ClientTimeout(
+            total=timeout, connect=connect_timeout, sock_read=sock_read_timeout
+        )
         self.session = None
 
+        self.connector = connector
+        self._owns_connector = connector is None
+        self._connector_args = {
+            "limit": limit,
+            "limit_per_host": limit_per_host,
+            "keepalive_timeout": keepalive_timeout,
+            "ttl_dns_cache": ttl_dns_cache,
+        }
+        self.prewarm = prewarm
+
+        self.keep_response = keep_response
         self.convert_resp = functools.partial(
-            convert_to_model, raise_on_api_err=raise_on_api_err
+            convert_to_model,
+            raise_on_api_err=raise_on_api_err,
+            keep_response=keep_response,
+        )
+        self.convert_body = functools.partial(
+            convert_body, raise_on_api_err=raise_on_api_err, keep_response=keep_response
+        )
+        self.raise_on_api_err = raise_on_api_err
+        self.convert_executor = convert_executor
+        self.offload_threshold = offload_threshold
+
+        self.rate_limiter = rate_limiter or ratelimit.RateLimiter()
+        self.max_rate_limit_retries = max_rate_limit_retries
+        self.retry_policy = retry_policy or retry.RetryPolicy()
+        self.on_retry = on_retry
+        self.sample_id_cache = (
+            sample_id_cache
+            if sample_id_cache is not None
+            else cache.MemorySampleIDCache()
+        )
+        self.report_cache = report_cache
+        self.json_codec = json_codec or codec.default_codec()
+        self.single_flight = utils.SingleFlight() if coalesce else None
+        self.validator_cache = (
+            validator_cache if validator_cache is not None else cache.ValidatorCache()
         )
 
     async def __aenter__(
@@ -249,11 +647,40 @@ class PyHatchingClient:
         await self.close()
 
     async def start(self):
-        """Start the client session."""
+        """Start the client session, opening ``prewarm`` connections if set."""
+
+        if self._owns_connector:
+            self.connector = aiohttp.TCPConnector(**self._connector_args)
+
         self.session = aiohttp.ClientSession(
-            base_url=self.url, headers=self.headers, timeout=self.timeout
+            base_url=self.url,
+            headers=self.headers,
+            timeout=self.timeout,
+            connector=self.connector,
+            connector_owner=self._owns_connector,
+            json_serialize=self.json_codec.dumps,
         )
 
+        if self.prewarm > 0:
+            await self._prewarm(self.prewarm)
+
+    async def _prewarm(self, count: int):
+        """Open up to ``count`` keep-alive connections to the API at once.
+
+        Uses ``HEAD`` requests to the site root, which aren't API calls and so
+        don't use any rate limit budget. Failures are ignored - the connections
+        will just be opened by the first real requests instead.
+        """
+
+        async def head():
+            try:
+                async with self.session.head("/", allow_redirects=False):
+                    pass
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                pass
+
+        await asyncio.gather(*(head() for _ in range(count)))
+
     async def close(self):
         """Close the client session."""
         await self.session.close()
@@ -262,10 +689,15 @@ class PyHatchingClient:
         self,
         method: str,
         uri: str,
-        data: aiohttp.MultipartWriter | None = None,
+        data: aiohttp.MultipartWriter
+        | Callable[[], aiohttp.MultipartWriter]
+        | None = None,
         json: dict | None = None,
         params: dict | None = None,
         raw: bool = False,
+        timeout: aiohttp.ClientTimeout | None = None,
+        headers: dict | None = None,
+        auto_decompress: bool = True,
     ) -> tuple[aiohttp.ClientResponse, dict]:
         """Make an HTTP request to the Hatching Triage Sandbox API.
 
@@ -276,14 +708,23 @@ class PyHatchingClient:
         can trust the API to return proper errors, so we'll only raise when there
         are connection issues or unexpected responses.
 
+        Every request first waits on ``rate_limiter`` for its endpoint class.
+        If the API responds with HTTP 429, the endpoint class' bucket is paused
+        (per ``Retry-After``) and the request is sent again, up to
+        ``max_rate_limit_retries`` times.
+
+        Transient failures are retried with backoff according to ``retry_policy``.
+
         Parameters
         ----------
         method : str
             The HTTP method to use for the request.
         uri : str
             The URI (without the session's base_url) to make the request to.
-        data : dict | None, optional
+        data : aiohttp.MultipartWriter | Callable | None, optional
             The HTTP form data to send with this request, by default None.
+            Pass a callable that builds the form data to allow the request
+            to be sent again if a streamed body was already consumed.
         json : dict | None, optional
             The JSON data to send in this request's HTTP body, by default None.
         params : dict | None, optional
@@ -291,6 +732,13 @@ class PyHatchingClient:
         raw : dict | False, optional
             Return the raw response without calling ``json`` on the response.
             Returns an empty dict as the 2nd return value.
+        timeout : aiohttp.ClientTimeout | None, optional
+            The timeout for this request, by default None (the session's).
+        headers : dict | None, optional
+            Extra HTTP headers to send with this request, by default None.
+        auto_decompress : bool, optional
+            Whether aiohttp decodes a compressed body, by default True. Only
+            useful with ``raw``, to read the body as it was sent.
 
         Returns
         -------
@@ -308,27 +756,179 @@ class PyHatchingClient:
             If the JSON response could not be parsed.
         """
 
-        try:
-            resp = await self.session.request(
-                method, f"{API_PATH}{uri}", data=data, json=json, params=params
-            )
+        endpoint = ratelimit.endpoint_class(method, uri)
+        # A streamed body can't be replayed, so only retry if it can be rebuilt.
+        can_resend = data is None or callable(data)
+        attempt = 0
+        throttled = 0
+
+        while True:
+            await self.rate_limiter.acquire(endpoint)
+
+            try:
+                resp = await self.session.request(
+                    method,
+                    f"{API_PATH}{uri}",
+                    data=data() if callable(data) else data,
+                    json=json,
+                    params=params,
+                    timeout=timeout or self.timeout,
+                    headers=headers,
+                    auto_decompress=auto_decompress,
+                )
+
+                self.rate_limiter.observe(endpoint, resp.status, resp.headers)
+
+                if (
+                    resp.status == 429
+                    and can_resend
+                    and throttled < self.max_rate_limit_retries
+                ):
+                    resp.release()
+                    throttled += 1
+                    continue
+
+                if can_resend and self.retry_policy.retry_status(
+                    method, resp.status, attempt
+                ):
+                    resp.release()
+                    reason = resp.status
+                elif raw:
+                    return resp, {}
+                else:
+                    return resp, await resp.json(loads=self.json_codec.loads)
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                if not (can_resend and self.retry_policy.retry_error(method, err, attempt)):
+                    raise errors.PyHatchingRequestError(
+                        f"Error making an HTTP request to Hatching Triage: {err}"
+                    ) from err
+                reason = err
+
+            except self.json_codec.decode_errors as err:
+                raise errors.PyHatchingJsonError(
+                    f"Unable to parse the response json: {err}"
+                ) from err
+
+            attempt += 1
+            delay = self.retry_policy.delay(attempt)
+            if self.on_retry is not None:
+                self.on_retry(method, uri, attempt, delay, reason)
+            await asyncio.sleep(delay)
+
+    async def _request_body(
+        self, method: str, uri: str, **kwargs
+    ) -> tuple[base.ResponseMeta, bytes]:
+        """Make a request with ``_request`` and read its raw body.
+
+        Takes the same keyword arguments as ``_request`` (except ``raw``).
+        Returns a summary of the response, whose ``elapsed`` covers everything
+        from the first attempt (including rate limit waits and retries) until
+        the body was read, and the body.
+
+        GETs without a body or extra headers are shared with identical ones
+        already in flight through ``single_flight``, and revalidated with
+        ``validator_cache``: if the API answers ``304 Not Modified``, the cached
+        response is returned instead.
+
+        Bodies are requested with every encoding in ``compression.DECODERS`` and
+        decoded here, the returned summary records their size on the wire and
+        decoded, and the decoding time.
+        """
+
+        if method.lower() != "get" or not kwargs.keys() <= {"params", "timeout"}:
+            return await self._read_body(method, uri, **kwargs)
 
-            if raw:
-                return resp, {}
+        params = kwargs.get("params") or {}
+        key = (uri, tuple(sorted(params.items())))
+        if self.single_flight is None:
+            return await self._read_body(method, uri, key, **kwargs)
+        return await self.single_flight.do(
+            key, functools.partial(self._read_body, method, uri, key, **kwargs)
+        )
+
+    async def _read_body(
+        self, method: str, uri: str, key: tuple | None = None, **kwargs
+    ) -> tuple[base.ResponseMeta, bytes]:
+        """Make a request and read its body, conditionally if ``key`` is set."""
 
-            resp_json = await resp.json()
+        start = time.monotonic()
+        conditional = self.validator_cache.headers(key) if key is not None else {}
+        headers = {"Accept-Encoding": compression.accept_encoding(), **conditional}
+        resp, _ = await self._request(
+            method, uri, raw=True, headers=headers, auto_decompress=False, **kwargs
+        )
+        async with resp:
+            try:
+                wire = await resp.read()
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                raise errors.PyHatchingRequestError(
+                    f"Error reading the response from Hatching Triage: {err}"
+                ) from err
 
-        except aiohttp.ClientError as err:
+        encoding = resp.headers.get("Content-Encoding")
+        try:
+            body, decode_time = compression.decode(wire, encoding)
+        except ValueError as err:
             raise errors.PyHatchingRequestError(
-                f"Error making an HTTP request to Hatching Triage: {err}"
+                f"Error decoding the response from Hatching Triage: {err}"
             ) from err
 
-        except JSONDecodeError as err:
-            raise errors.PyHatchingJsonError(
-                f"Unable to parse the response json: {err}"
-            ) from err
+        meta = dataclasses.replace(
+            response_meta(resp, time.monotonic() - start, self.keep_response),
+            content_encoding=encoding,
+            wire_bytes=len(wire),
+            body_bytes=len(body),
+            decode_time=decode_time,
+        )
+        if key is None:
+            return meta, body
+
+        if resp.status == 304 and conditional:
+            cached = self.validator_cache.revalidated(key)
+            if cached is None:
+                # Evicted while the request was in flight.
+                return await self._read_body(method, uri, None, **kwargs)
+            cached_meta = dataclasses.replace(
+                cached.meta,
+                elapsed=meta.elapsed,
+                wire_bytes=meta.wire_bytes,
+                decode_time=meta.decode_time,
+            )
+            return cached_meta, cached.body
+
+        if resp.status == 200:
+            self.validator_cache.store(
+                key,
+                resp.headers.get("ETag"),
+                resp.headers.get("Last-Modified"),
+                meta,
+                body,
+            )
+        return meta, body
+
+    async def _convert(
+        self, model: type[base.HatchingResponse], meta: base.ResponseMeta, body: bytes
+    ) -> base.HatchingResponse | base.ResultsPage:
+        """``convert_body``, in ``convert_executor`` if ``body`` is large enough."""
+
+        if self.convert_executor is None or len(body) < self.offload_threshold:
+            return self.convert_body(model, meta, body)
+
+        loop = asyncio.get_running_loop()
+        parsed = await loop.run_in_executor(
+            self.convert_executor,
+            _convert_offloaded,
+            getattr(model, "__projection__", (model, None)),
+            dataclasses.replace(meta, raw=None),
+            body,
+            self.raise_on_api_err,
+        )
 
-        return resp, resp_json
+        # The raw response can't be sent to another process, reattach it.
+        for item in parsed if isinstance(parsed, base.ResultsPage) else (parsed,):
+            item.resp_obj = meta
+        return parsed
 
     async def norm_sample(self, sample: str) -> str | None:
         """Return a sample ID if sample is a hash, otherwise pass it back."""
@@ -374,8 +974,10 @@ class PyHatchingClient:
 
         return None
 
-    async def get_sample(self, sample: str) -> base.SampleInfo | base.ErrorResponse:
-        """Get metadata about a sample by hash or sample ID.
+    async def download_sample_iter(
+        self, sample: str, chunk_size: int = CHUNK_SIZE
+    ) -> AsyncIterator[bytes]:
+        """Stream a sample's bytes in chunks instead of buffering the whole file.
 
         Parameters
         ----------
@@ -384,164 +986,1318 @@ class PyHatchingClient:
             as the value is passed to ``sample_id`` if needed to find the ID::
 
                 sample uuid, md5, sha1, sha2, ssdeep
+        chunk_size : int, optional
+            The maximum size of each yielded chunk, by default CHUNK_SIZE.
 
-        Raises
+        Yields
         ------
-        PyHatchingError
-            When a sample cannot be found.
-
-        Returns
-        -------
-        base.SampleInfo
-            The sample's metadata
-        base.ErrorResponse
-            If the API returns an error.
-        None
-            If the sample is not found.
+        bytes
+            The next chunk of the sample. Nothing is yielded if the sample is
+            not found or cannot be downloaded.
         """
 
         sample_id = await self.norm_sample(sample)
         if sample_id is None:
-            return None
+            return
 
-        resp, resp_dict = await self._request("get", f"/samples/{sample}")
+        async for chunk in self._stream(f"/samples/{sample_id}/sample", chunk_size):
+            yield chunk
 
-        return self.convert_resp(base.SampleInfo, resp, resp_dict)
+    async def download_sample_to(
+        self,
+        sample: str,
+        dest: str | pathlib.Path | BinaryIO,
+        chunk_size: int = CHUNK_SIZE,
+        verify: bool = True,
+    ) -> base.DownloadResult | None:
+        """Stream a sample to a file, hashing it as the bytes are written.
 
-    async def get_profile(
-        self, profile_id: str
-    ) -> base.HatchingProfileResponse | base.ErrorResponse:
-        """Get a sandbox analysis profile by either ID or name.
+        Only ``chunk_size`` bytes of the sample are held in memory at a time.
+        A download that's interrupted is resumed where it left off, see
+        ``_download_to``.
 
         Parameters
         ----------
-        profile_id : str
-            Either the ``id`` (UUID4) or the name of the profile.
-
-        Returns
-        -------
-        base.HatchingProfileResponse
-            If successful, the requested sandbox profile.
-        base.ErrorResponse
-            If there was an error.
-        """
-
-        resp, resp_dict = await self._request("get", f"/profiles/{profile_id}")
-
-        return self.convert_resp(base.HatchingProfileResponse, resp, resp_dict)
+        sample : str
+            The sample to download, this can be any of the following
+            as the value is passed to ``sample_id`` if needed to find the ID::
 
-    async def get_profiles(
-        self,
-    ) -> list[base.HatchingProfileResponse] | base.ErrorResponse:
-        """Get all sandbox analysis profiles for your account.
+                sample uuid, md5, sha1, sha2, ssdeep
+        dest : str | pathlib.Path | BinaryIO
+            The path to write the sample to, or an open binary file object.
+            A path is only created once the download is complete, until then
+            the bytes are written to ``<dest>.part``.
+        chunk_size : int, optional
+            The maximum number of bytes to read and write at a time,
+            by default CHUNK_SIZE.
+        verify : bool, optional
+            Check the sha256 of the download against the sample's, by default True.
+            The sha256 is taken from ``sample`` if it is one, otherwise it's
+            looked up with ``get_sample``.
 
         Returns
         -------
-        list[base.HatchingProfileResponse]
-            If successful, the requested sandbox profiles.
-        base.ErrorResponse
-            If there was an error.
+        base.DownloadResult
+            The number of bytes written and their sha256.
+        None
+            If no bytes can be downloaded or the sample is not found.
+
+        Raises
+        ------
+        PyHatchingFileError
+            If ``dest`` cannot be written to.
+        PyHatchingValueError
+            If ``verify`` is set and the download doesn't match the sample's sha256.
         """
 
-        resp, resp_dict = await self._request("get", "/profiles")
+        sample_id = await self.norm_sample(sample)
+        if sample_id is None:
+            return None
 
-        return self.convert_resp(base.HatchingProfileResponse, resp, resp_dict)
+        sha256 = None
+        if verify:
+            if utils.hash_type(sample) == enums.HashPrefixes.SHA2.value:
+                sha256 = sample
+            else:
+                info = await self.get_sample(sample_id)
+                if isinstance(info, base.SampleInfo):
+                    sha256 = info.sha256
+
+        return await self._download_to(
+            f"/samples/{sample_id}/sample", dest, chunk_size, sha256=sha256
+        )
 
-    async def get_rule(self, rule_name: str) -> base.YaraRule | base.ErrorResponse:
-        """Get a single Yara rule by name.
+    async def download_pcap(
+        self,
+        sample: str,
+        task: str,
+        dest: str | pathlib.Path | BinaryIO,
+        pcapng: bool = False,
+        chunk_size: int = CHUNK_SIZE,
+        max_size: int | None = None,
+    ) -> base.DownloadResult | None:
+        """Stream the network capture of a task to a file.
 
         Parameters
         ----------
-        rule_name : str
-            The name of the rule.
-
-        Returns
-        -------
-        base.YaraRule
-            If successful, the returned Yara rule.
-        """
-
-        resp, resp_dict = await self._request("get", f"/yara/{rule_name}")
-
-        return self.convert_resp(base.YaraRule, resp, resp_dict)
+        sample : str
+            The sample the task belongs to, this can be any of the following
+            as the value is passed to ``sample_id`` if needed to find the ID::
 
-    async def get_rules(self) -> base.YaraRules | base.ErrorResponse:
-        """Get all Yara rules tied to your account.
+                sample uuid, md5, sha1, sha2, ssdeep
+        task : str
+            The name of the task, for example ``behavioral1``.
+        dest : str | pathlib.Path | BinaryIO
+            The path to write the capture to, or an open binary file object.
+        pcapng : bool, optional
+            Download the PCAPNG capture instead of the PCAP, by default False.
+        chunk_size : int, optional
+            The maximum number of bytes to read and write at a time,
+            by default CHUNK_SIZE.
+        max_size : int | None, optional
+            Stop and raise if the capture is larger than this, by default None.
 
         Returns
         -------
-        base.YaraRules
-            If successful, the returned Yara rules.
+        base.DownloadResult
+            The number of bytes written and their sha256.
+        None
+            If the capture or the sample is not found.
+
+        Raises
+        ------
+        PyHatchingFileError
+            If ``dest`` cannot be written to.
+        PyHatchingValueError
+            If the capture is larger than ``max_size``.
         """
 
-        resp, resp_dict = await self._request("get", "/yara")
+        sample_id = await self.norm_sample(sample)
+        if sample_id is None:
+            return None
 
-        return self.convert_resp(base.YaraRules, resp, resp_dict)
+        ext = "pcapng" if pcapng else "pcap"
+        return await self._download_to(
+            f"/samples/{sample_id}/{task}/dump.{ext}", dest, chunk_size, max_size
+        )
 
-    async def overview(self, sample: str) -> base.OverviewReport | base.ErrorResponse:
-        """Return a sample's Overview Report.
+    async def download_task_file(
+        self,
+        sample: str,
+        task: str,
+        name: str,
+        dest: str | pathlib.Path | BinaryIO,
+        chunk_size: int = CHUNK_SIZE,
+        max_size: int | None = None,
+    ) -> base.DownloadResult | None:
+        """Stream a file dumped during a task (a dropped file or memory dump) to a file.
 
         Parameters
         ----------
         sample : str
-            The sample to download, this can be any of the following
+            The sample the task belongs to, this can be any of the following
             as the value is passed to ``sample_id`` if needed to find the ID::
 
                 sample uuid, md5, sha1, sha2, ssdeep
+        task : str
+            The name of the task, for example ``behavioral1``.
+        name : str
+            The name of the dumped file, as in ``OverviewExtracted.dumped_file``
+            or ``Dump.name``.
+        dest : str | pathlib.Path | BinaryIO
+            The path to write the file to, or an open binary file object.
+        chunk_size : int, optional
+            The maximum number of bytes to read and write at a time,
+            by default CHUNK_SIZE.
+        max_size : int | None, optional
+            Stop and raise if the file is larger than this, by default None.
 
         Returns
         -------
-        base.OverviewReport
-            If successful, the return Overview Report.
-        base.ErrorResponse
-            If there was an error.
+        base.DownloadResult
+            The number of bytes written and their sha256.
         None
-            If the sample is not found.
+            If the file or the sample is not found.
+
+        Raises
+        ------
+        PyHatchingFileError
+            If ``dest`` cannot be written to.
+        PyHatchingValueError
+            If the file is larger than ``max_size``.
         """
 
         sample_id = await self.norm_sample(sample)
         if sample_id is None:
             return None
 
-        resp, resp_dict = await self._request(
-            "get", f"/samples/{sample_id}/overview.json"
+        return await self._download_to(
+            f"/samples/{sample_id}/{task}/files/{name}", dest, chunk_size, max_size
         )
 
-        return self.convert_resp(base.OverviewReport, resp, resp_dict)
-
-    async def sample_id(self, file_hash: str) -> str | None:
-        """Find the ID of a sample by the given hash, uses ``search`` under the hood.
+    async def download_artifacts(
+        self,
+        sample: str,
+        dest_dir: str | pathlib.Path,
+        kinds: Iterable[enums.ArtifactKinds] = (
+            enums.ArtifactKinds.PCAP,
+            enums.ArtifactKinds.EXTRACTED,
+        ),
+        concurrency: int = 4,
+        max_size: int | None = None,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> AsyncIterator[base.ArtifactResult | base.ErrorResponse]:
+        """Download the artifacts of a sample into a directory, yielding each when done.
+
+        Artifacts are found from the sample's overview report, and for
+        ``ArtifactKinds.DUMPED``, from the ``dumped`` section of each task's
+        report. They are written to ``dest_dir/<task>/<name>``, where ``name``
+        is ``dump.pcap``, ``dump.pcapng``, or the dumped file's name.
+        At most ``concurrency`` downloads run at once, each holding only
+        ``chunk_size`` bytes in memory.
+
+        An error raised by a single download (including going over ``max_size``)
+        is captured on its result instead of aborting the rest, and no partial
+        file is left behind. So is an error fetching a task's report to find its
+        dumped files, on a ``DUMPED`` result with an empty ``name``.
 
         Parameters
         ----------
-        file_hash : str
-            The hash (md5, sha1, sha2, ssdeep) of the file to get and ID for.
+        sample : str
+            The sample to download the artifacts of, this can be any of the
+            following as the value is passed to ``sample_id`` if needed to find
+            the ID::
 
-        Returns
-        -------
-        str
-            The sample ID that was found for ``file_hash``.
-        None
-            The sample ID could not be found.
-        """
+                sample uuid, md5, sha1, sha2, ssdeep
+        dest_dir : str | pathlib.Path
+            The directory to write the artifacts to, created if needed.
+        kinds : Iterable[enums.ArtifactKinds], optional
+            The kinds of artifacts to download, by default PCAP and EXTRACTED.
+        concurrency : int, optional
+            The maximum number of downloads at once, by default 4.
+        max_size : int | None, optional
+            The largest artifact to download, in bytes, by default None.
+        chunk_size : int, optional
+            The maximum number of bytes to read and write at a time,
+            by default CHUNK_SIZE.
+
+        Yields
+        ------
+        base.ArtifactResult
+            The download result or error, and the latency in seconds, of each
+            artifact.
+        base.ErrorResponse
+            If the API returns an error for the overview report, it is the
+            only item yielded.
 
-        hash_prefix = utils.hash_type(file_hash)
+        Raises
+        ------
+        PyHatchingValueError
+            If ``concurrency`` is less than 1.
+        """
 
-        if hash_prefix is None:
+        if concurrency < 1:
             raise errors.PyHatchingValueError(
-                f"The input hash is not valid according to 'utils.hash_type': {file_hash}"
+                f"concurrency must be a positive integer, not {concurrency}"
             )
 
-        samples = await self.search(f"{hash_prefix}:{file_hash}")
+        kinds = set(kinds)
+        sample_id = await self.norm_sample(sample)
+        if sample_id is None:
+            return
+
+        overview = await self.overview(
+            sample_id,
+            fields=(
+                "tasks",
+                "targets.tasks",
+                "extracted.tasks",
+                "extracted.dumped_file",
+            ),
+        )
+        if isinstance(overview, base.ErrorResponse):
+            yield overview
+            return
+
+        dynamic = [
+            t for t in _task_names(sample_id, overview) if not t.startswith("static")
+        ]
+        # The kind of each (task, name) artifact, in the order they're downloaded.
+        artifacts = {}
+        for task in dynamic:
+            if enums.ArtifactKinds.PCAP in kinds:
+                artifacts[(task, "dump.pcap")] = enums.ArtifactKinds.PCAP
+            if enums.ArtifactKinds.PCAPNG in kinds:
+                artifacts[(task, "dump.pcapng")] = enums.ArtifactKinds.PCAPNG
+
+        if enums.ArtifactKinds.EXTRACTED in kinds:
+            for extract in overview.extracted or []:
+                if not extract.dumped_file:
+                    continue
+                for task_id in extract.tasks:
+                    task = task_id.removeprefix(f"{sample_id}-")
+                    artifacts.setdefault(
+                        (task, extract.dumped_file), enums.ArtifactKinds.EXTRACTED
+                    )
+
+        if enums.ArtifactKinds.DUMPED in kinds:
+
+            async def find_dumped(task):
+                start = time.monotonic()
+                try:
+                    report = await self.triage_report(
+                        sample_id, task, fields=("dumped.name",)
+                    )
+                    if isinstance(report, base.ErrorResponse):
+                        raise errors.PyHatchingApiError(
+                            f"Hatching Triage API Error - {report.error} - {report.message}",
+                            response=report,
+                        )
+                except Exception as err:  # pylint: disable=broad-except
+                    return task, base.ArtifactResult(
+                        kind=enums.ArtifactKinds.DUMPED,
+                        task=task,
+                        name="",
+                        error=err,
+                        latency=time.monotonic() - start,
+                    )
+                return task, report
+
+            async for task, report in utils.bounded_as_completed(
+                find_dumped, dynamic, concurrency
+            ):
+                if isinstance(report, base.ArtifactResult):
+                    yield report
+                    continue
+                for dump in report.dumped or []:
+                    if dump.name:
+                        artifacts.setdefault(
+                            (task, dump.name), enums.ArtifactKinds.DUMPED
+                        )
+
+        root = pathlib.Path(dest_dir).resolve()
+
+        async def download(artifact):
+            (task, name), kind = artifact
+            start = time.monotonic()
+            try:
+                path = (root / task / name).resolve()
+                if not path.is_relative_to(root):
+                    raise errors.PyHatchingValueError(
+                        f"Refusing to write {name} outside of {root}"
+                    )
+                path.parent.mkdir(parents=True, exist_ok=True)
+                if kind == enums.ArtifactKinds.PCAP:
+                    result = await self.download_pcap(
+                        sample_id, task, path, False, chunk_size, max_size
+                    )
+                elif kind == enums.ArtifactKinds.PCAPNG:
+                    result = await self.download_pcap(
+                        sample_id, task, path, True, chunk_size, max_size
+                    )
+                else:
+                    result = await self.download_task_file(
+                        sample_id, task, name, path, chunk_size, max_size
+                    )
+            except Exception as err:  # pylint: disable=broad-except
+                return base.ArtifactResult(
+                    kind=kind,
+                    task=task,
+                    name=name,
+                    error=err,
+                    latency=time.monotonic() - start,
+                )
+            return base.ArtifactResult(
+                kind=kind,
+                task=task,
+                name=name,
+                result=result,
+                latency=time.monotonic() - start,
+            )
+
+        async for result in utils.bounded_as_completed(
+            download, artifacts.items(), concurrency
+        ):
+            yield result
+
+    async def _stream(
+        self, uri: str, chunk_size: int, max_size: int | None = None
+    ) -> AsyncIterator[bytes]:
+        """Yield the body of a successful GET to ``uri`` in chunks.
+
+        Raises ``PyHatchingValueError`` once the body is larger than ``max_size``.
+        """
+
+        resp, _ = await self._request("get", uri, raw=True)
+        async with resp:
+            if resp.status != 200:
+                return
+            if max_size is not None and (resp.content_length or 0) > max_size:
+                raise errors.PyHatchingValueError(
+                    f"{uri} is {resp.content_length} bytes, more than {max_size}"
+                )
+            size = 0
+            try:
+                async for chunk in resp.content.iter_chunked(chunk_size):
+                    size += len(chunk)
+                    if max_size is not None and size > max_size:
+                        raise errors.PyHatchingValueError(
+                            f"{uri} is more than {max_size} bytes"
+                        )
+                    yield chunk
+            except aiohttp.ClientError as err:
+                raise errors.PyHatchingRequestError(
+                    f"Error streaming {uri} from Hatching Triage: {err}"
+                ) from err
+
+    async def _download_to(
+        self,
+        uri: str,
+        dest: str | pathlib.Path | BinaryIO,
+        chunk_size: int,
+        max_size: int | None = None,
+        sha256: str | None = None,
+    ) -> base.DownloadResult | None:
+        """Write the body of a GET to ``uri`` to ``dest`` while hashing it.
+
+        A path ``dest`` is written to ``<dest>.part`` and renamed once the
+        download is complete. If the body stops part way (a retryable error per
+        ``retry_policy``), it's requested again with a ``Range`` header for the
+        bytes that are missing, and appended to what was already written. A
+        ``.part`` file left by an earlier call is resumed the same way, if its
+        ``<dest>.part.json`` checkpoint is for the same ``uri``. Resumed requests
+        send ``If-Range`` with the validator (``ETag`` or ``Last-Modified``) of the
+        first response, so if the body changed, or the server ignores the range,
+        the download starts over. Bodies are requested without content coding,
+        so the range offsets are byte offsets of the file itself.
+
+        The ``.part`` file is kept for a later call unless the body is gone
+        (404, 410) or the download can't be resumed.
+
+        ``max_size`` limits the size of the whole body, and if ``sha256`` is set,
+        a download that doesn't match it is discarded and raises
+        ``PyHatchingValueError``.
+        """
+
+        owns_fd = isinstance(dest, (str, pathlib.Path))
+        part = pathlib.Path(f"{dest}.part") if owns_fd else None
+        checkpoint = pathlib.Path(f"{dest}.part.json") if owns_fd else None
+        digest = hashlib.sha256()
+        size = 0
+        fd = None
+        validator = None
+
+        def discard():
+            part.unlink(missing_ok=True)
+            checkpoint.unlink(missing_ok=True)
+
+        if owns_fd and part.exists():
+            try:
+                saved = self.json_codec.loads(checkpoint.read_bytes())
+            except (OSError, *self.json_codec.decode_errors):
+                saved = {}
+            if not isinstance(saved, dict) or saved.get("uri") != uri:
+                # Not known to be a prefix of this body.
+                discard()
+            else:
+                validator = saved.get("validator")
+
+        if owns_fd and part.exists():
+            try:
+                with part.open("rb") as part_fd:
+                    for chunk in iter(functools.partial(part_fd.read, CHUNK_SIZE), b""):
+                        digest.update(chunk)
+                        size += len(chunk)
+            except OSError as err:
+                raise errors.PyHatchingFileError(
+                    f"Unable to read {part} to resume {uri}: {err}"
+                ) from err
+        resumed = 0
+        start_pos = None if owns_fd else _tell(dest)
+
+        def restart():
+            # The server sent the whole body, drop what was written before.
+            nonlocal digest, size
+            if size:
+                if owns_fd:
+                    fd.seek(0)
+                elif start_pos is None:
+                    raise errors.PyHatchingRequestError(
+                        f"Unable to resume {uri}, the server sent the whole body again"
+                    )
+                else:
+                    fd.seek(start_pos)
+                fd.truncate()
+            digest = hashlib.sha256()
+            size = 0
+
+        attempt = 0
+        try:
+            while True:
+                headers = {"Accept-Encoding": "identity"}
+                if size:
+                    headers["Range"] = f"bytes={size}-"
+                    if validator is not None:
+                        headers["If-Range"] = validator
+                resp, _ = await self._request("get", uri, raw=True, headers=headers)
+                async with resp:
+                    if resp.status == 416 and size:
+                        # What we have is no prefix of the body, start over.
+                        if fd is None and owns_fd:
+                            discard()
+                            digest, size = hashlib.sha256(), 0
+                        else:
+                            restart()
+                        continue
+                    if resp.status not in (200, 206):
+                        if owns_fd and resp.status in (404, 410):
+                            discard()
+                        return None
+
+                    if resp.status == 200 or validator is None:
+                        validator = _range_validator(resp)
+                    if fd is None:
+                        # pylint: disable-next=consider-using-with
+                        fd = part.open("ab") if owns_fd else dest
+                    if owns_fd and resp.status == 200:
+                        checkpoint.write_text(
+                            self.json_codec.dumps({"uri": uri, "validator": validator})
+                        )
+                    if resp.status == 206 and not _range_starts_at(resp, size):
+                        # Not the range asked for, ask for the whole body instead.
+                        restart()
+                        resumed = 0
+                        continue
+                    if resp.status == 200:
+                        restart()
+                        resumed = 0
+                    else:
+                        resumed += size
+
+                    remaining = resp.content_length
+                    if (
+                        max_size is not None
+                        and remaining is not None
+                        and size + remaining > max_size
+                    ):
+                        raise errors.PyHatchingValueError(
+                            f"{uri} is {size + remaining} bytes, more than {max_size}"
+                        )
+
+                    try:
+                        async for chunk in resp.content.iter_chunked(chunk_size):
+                            size += len(chunk)
+                            if max_size is not None and size > max_size:
+                                raise errors.PyHatchingValueError(
+                                    f"{uri} is more than {max_size} bytes"
+                                )
+                            fd.write(chunk)
+                            digest.update(chunk)
+                        break
+                    except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                        if not self.retry_policy.retry_error("get", err, attempt):
+                            raise errors.PyHatchingRequestError(
+                                f"Error streaming {uri} from Hatching Triage: {err}"
+                            ) from err
+                        fd.flush()
+                        reason = err
+
+                attempt += 1
+                delay = self.retry_policy.delay(attempt)
+                if self.on_retry is not None:
+                    self.on_retry("get", uri, attempt, delay, reason)
+                await asyncio.sleep(delay)
+
+            if owns_fd:
+                fd.close()
+            if sha256 is not None and digest.hexdigest() != sha256.lower():
+                raise errors.PyHatchingValueError(
+                    f"{uri} has sha256 {digest.hexdigest()}, expected {sha256}"
+                )
+            if owns_fd:
+                part.replace(dest)
+                checkpoint.unlink(missing_ok=True)
+
+        except BaseException as err:
+            if owns_fd and fd is not None:
+                fd.close()
+            # Keep the bytes of a download that can be resumed, otherwise don't
+            # leave a truncated or bad file behind.
+            if owns_fd and not isinstance(
+                err, (errors.PyHatchingRequestError, asyncio.CancelledError)
+            ):
+                discard()
+            if isinstance(err, OSError) and not isinstance(err, errors.PyHatchingError):
+                raise errors.PyHatchingFileError(
+                    f"Unable to write {uri} to {dest}: {err}"
+                ) from err
+            raise
+
+        return base.DownloadResult(
+            size=size,
+            sha256=digest.hexdigest(),
+            path=str(dest) if owns_fd else None,
+            resumed=resumed,
+        )
+
+    async def events(
+        self, sample: str | None = None, max_reconnects: int = 5
+    ) -> AsyncIterator[base.SampleInfo | base.ErrorResponse]:
+        """Stream status changes of one sample, or of all your samples.
+
+        Reads the newline delimited JSON of ``/samples/{id}/events`` (or
+        ``/samples/events``) one line at a time over a single long-lived
+        connection. If the connection drops, it's reopened, and events already
+        yielded (the same sample in the same status) are skipped.
+
+        The stream of a single sample ends once it's in one of
+        ``enums.CompleteStatuses``, the stream of all samples doesn't end.
+
+        Parameters
+        ----------
+        sample : str | None, optional
+            The sample to stream the events of, this can be any of the following
+            as the value is passed to ``sample_id`` if needed to find the ID::
+
+                sample uuid, md5, sha1, sha2, ssdeep
+
+            By default None, the events of all your samples are streamed.
+        max_reconnects : int, optional
+            How many times in a row the stream is reopened after it drops
+            without yielding a new event, by default 5.
+
+        Yields
+        ------
+        base.SampleInfo
+            The sample after each status change.
+        base.ErrorResponse
+            If the API returns an error, it is yielded as the final item.
+
+        Raises
+        ------
+        PyHatchingRequestError
+            If the stream dropped more than ``max_reconnects`` times in a row.
+        PyHatchingValidateError
+            If an event isn't a sample.
+        """
+
+        if sample is None:
+            uri = "/samples/events"
+        else:
+            sample_id = await self.norm_sample(sample)
+            if sample_id is None:
+                return
+            uri = f"/samples/{sample_id}/events"
+
+        async for info in self._events(uri, sample is not None, max_reconnects):
+            yield info
+
+    async def _events(
+        self,
+        uri: str,
+        single: bool,
+        max_reconnects: int,
+        connected: asyncio.Event | None = None,
+    ) -> AsyncIterator[base.SampleInfo | base.ErrorResponse]:
+        """Read an events stream, see ``events``.
+
+        ``single`` ends the stream once a sample finishes, ``connected`` is set
+        once the stream has been opened.
+        """
+
+        complete = {s.value for s in enums.CompleteStatuses}
+        # Events are sparse, so only limit how long connecting may take.
+        timeout = aiohttp.ClientTimeout(total=None, connect=self.timeout.connect)
+        seen = {}
+        failures = 0
+
+        while True:
+            try:
+                resp, _ = await self._request("get", uri, raw=True, timeout=timeout)
+                async with resp:
+                    if connected is not None:
+                        connected.set()
+                    meta = response_meta(resp, keep_response=self.keep_response)
+                    if resp.status != 200:
+                        yield self.convert_body(base.SampleInfo, meta, await resp.read())
+                        return
+
+                    async for line in utils.iter_lines(
+                        resp.content.iter_chunked(CHUNK_SIZE)
+                    ):
+                        info = self.convert_body(base.SampleInfo, meta, line)
+                        if isinstance(info, base.ErrorResponse):
+                            yield info
+                            return
+                        if not isinstance(info, base.SampleInfo):
+                            raise errors.PyHatchingValidateError(
+                                f"Unexpected event from {uri}: {line[:200]!r}"
+                            )
+                        if seen.get(info.id) == info.status:
+                            continue
+                        # A finished sample won't change again, forget it so a
+                        # long lived stream doesn't keep every sample it's seen.
+                        if info.status.value in complete:
+                            seen.pop(info.id, None)
+                        else:
+                            seen[info.id] = info.status
+                        failures = 0
+                        yield info
+                        if single and info.status.value in complete:
+                            return
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                reason = err
+            except errors.PyHatchingRequestError as err:
+                reason = err.__cause__ or err
+            else:
+                reason = EOFError(f"The {uri} stream ended")
+
+            failures += 1
+            if failures > max_reconnects:
+                raise errors.PyHatchingRequestError(
+                    f"The {uri} stream dropped {failures} times, last: {reason}"
+                )
+            delay = self.retry_policy.delay(failures)
+            if self.on_retry is not None:
+                self.on_retry("get", uri, failures, delay, reason)
+            await asyncio.sleep(delay)
+
+    async def get_sample(self, sample: str) -> base.SampleInfo | base.ErrorResponse:
+        """Get metadata about a sample by hash or sample ID.
+
+        Parameters
+        ----------
+        sample : str
+            The sample to download, this can be any of the following
+            as the value is passed to ``sample_id`` if needed to find the ID::
+
+                sample uuid, md5, sha1, sha2, ssdeep
+
+        Raises
+        ------
+        PyHatchingError
+            When a sample cannot be found.
+
+        Returns
+        -------
+        base.SampleInfo
+            The sample's metadata
+        base.ErrorResponse
+            If the API returns an error.
+        None
+            If the sample is not found.
+        """
+
+        sample_id = await self.norm_sample(sample)
+        if sample_id is None:
+            return None
+
+        meta, body = await self._request_body("get", f"/samples/{sample_id}")
+
+        return await self._convert(base.SampleInfo, meta, body)
+
+    async def get_profile(
+        self, profile_id: str
+    ) -> base.HatchingProfileResponse | base.ErrorResponse:
+        """Get a sandbox analysis profile by either ID or name.
+
+        Parameters
+        ----------
+        profile_id : str
+            Either the ``id`` (UUID4) or the name of the profile.
+
+        Returns
+        -------
+        base.HatchingProfileResponse
+            If successful, the requested sandbox profile.
+        base.ErrorResponse
+            If there was an error.
+        """
+
+        meta, body = await self._request_body("get", f"/profiles/{profile_id}")
+
+        return await self._convert(base.HatchingProfileResponse, meta, body)
+
+    async def get_profiles(
+        self,
+    ) -> list[base.HatchingProfileResponse] | base.ErrorResponse:
+        """Get all sandbox analysis profiles for your account.
+
+        Returns
+        -------
+        list[base.HatchingProfileResponse]
+            If successful, the requested sandbox profiles.
+        base.ErrorResponse
+            If there was an error.
+        """
+
+        meta, body = await self._request_body("get", "/profiles")
+
+        return await self._convert(base.HatchingProfileResponse, meta, body)
+
+    async def get_rule(self, rule_name: str) -> base.YaraRule | base.ErrorResponse:
+        """Get a single Yara rule by name.
+
+        Parameters
+        ----------
+        rule_name : str
+            The name of the rule.
+
+        Returns
+        -------
+        base.YaraRule
+            If successful, the returned Yara rule.
+        """
+
+        meta, body = await self._request_body("get", f"/yara/{rule_name}")
+
+        return await self._convert(base.YaraRule, meta, body)
+
+    async def get_rules(self) -> base.YaraRules | base.ErrorResponse:
+        """Get all Yara rules tied to your account.
+
+        Returns
+        -------
+        base.YaraRules
+            If successful, the returned Yara rules.
+        """
+
+        meta, body = await self._request_body("get", "/yara")
+
+        return await self._convert(base.YaraRules, meta, body)
+
+    async def kernel_log(
+        self,
+        sample: str,
+        task: str,
+        kinds: Iterable[str] | None = None,
+        log_name: str = "onemon.json",
+        chunk_size: int = CHUNK_SIZE,
+    ) -> AsyncIterator[base.LogEvent | base.ErrorResponse]:
+        """Stream the events of a task's kernel monitor log one line at a time.
+
+        These logs are newline delimited JSON and often hundreds of MB, so they
+        are never read into memory as a whole - only the current line is.
+
+        Parameters
+        ----------
+        sample : str
+            The sample to get the log of, this can be any of the following
+            as the value is passed to ``sample_id`` if needed to find the ID::
+
+                sample uuid, md5, sha1, sha2, ssdeep
+        task : str
+            The name of the task, for example ``behavioral1``.
+        kinds : Iterable[str] | None, optional
+            Only yield events of these kinds (e.g. ``onemon.Process``). Lines
+            that can't be one of them are skipped before being parsed.
+            By default None, every event is yielded.
+        log_name : str, optional
+            The name of the log file, by default "onemon.json".
+        chunk_size : int, optional
+            The number of bytes read from the connection at a time,
+            by default CHUNK_SIZE.
+
+        Yields
+        ------
+        base.LogEvent
+            Each event in the log.
+        base.ErrorResponse
+            If the API returns an error, it is the only item yielded.
+
+        Raises
+        ------
+        PyHatchingRequestError
+            If the connection fails while reading the log.
+        PyHatchingJsonError
+            If a line of the log is not valid JSON.
+        PyHatchingValidateError
+            If a line of the log is not an event.
+        """
+
+        sample_id = await self.norm_sample(sample)
+        if sample_id is None:
+            return
+
+        uri = f"/samples/{sample_id}/{task}/logs/{log_name}"
+        kinds = frozenset(kinds) if kinds is not None else None
+        needles = [f'"{kind}"'.encode() for kind in kinds or ()]
+        # The whole log may take longer than the total timeout, only limit
+        # how long any one read can take.
+        timeout = aiohttp.ClientTimeout(
+            total=None, connect=self.timeout.connect, sock_read=self.timeout.total
+        )
+        adapter = TypeAdapter(base.LogEvent)
+
+        resp, _ = await self._request("get", uri, raw=True, timeout=timeout)
+        async with resp:
+            if resp.status != 200:
+                meta = response_meta(resp, keep_response=self.keep_response)
+                yield self.convert_body(base.ErrorResponse, meta, await resp.read())
+                return
+
+            first = True
+            try:
+                async for line in utils.iter_lines(
+                    resp.content.iter_chunked(chunk_size)
+                ):
+                    # An API error is a single line, without an event's kind.
+                    if first and b'"error"' in line and b'"kind"' not in line:
+                        meta = response_meta(resp, keep_response=self.keep_response)
+                        yield self.convert_body(base.ErrorResponse, meta, line)
+                        return
+                    first = False
+
+                    if needles and not any(n in line for n in needles):
+                        continue
+                    try:
+                        event = adapter.validate_json(line)
+                    except ValidationError as err:
+                        if err.errors()[0]["type"] == "json_invalid":
+                            raise errors.PyHatchingJsonError(
+                                f"Unable to parse a line of {uri}: {err}"
+                            ) from err
+                        raise errors.PyHatchingValidateError(
+                            f"Unable to validate a line of {uri}: {err}"
+                        ) from err
+                    if kinds is None or event.kind in kinds:
+                        yield event
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                raise errors.PyHatchingRequestError(
+                    f"Error streaming {uri} from Hatching Triage: {err}"
+                ) from err
+
+    async def overview(
+        self, sample: str, fields: Iterable[str] | None = None
+    ) -> base.OverviewReport | base.ErrorResponse:
+        """Return a sample's Overview Report.
+
+        If the client has a ``report_cache``, it's checked first, and finished
+        reports are added to it. Cached reports have no ``resp_obj``.
+
+        Parameters
+        ----------
+        sample : str
+            The sample to download, this can be any of the following
+            as the value is passed to ``sample_id`` if needed to find the ID::
+
+                sample uuid, md5, sha1, sha2, ssdeep
+        fields : Iterable[str] | None, optional
+            Only build these fields of the report, see ``base.projected_model``.
+            For example ``{"analysis", "sample.sha256"}``. Skipping the large
+            nested sections saves most of the time and memory of a report.
+            By default None, the full report is built.
+
+        Returns
+        -------
+        base.OverviewReport
+            If successful, the return Overview Report. A projection of it if
+            ``fields`` is set.
+        base.ErrorResponse
+            If there was an error.
+        None
+            If the sample is not found.
+        """
+
+        model = base.OverviewReport
+        if fields is not None:
+            try:
+                model = base.projected_model(model, frozenset(fields))
+            except ValueError as err:
+                raise errors.PyHatchingValueError(str(err)) from err
+
+        sample_id = await self.norm_sample(sample)
+        if sample_id is None:
+            return None
+
+        loop = asyncio.get_running_loop()
+        if self.report_cache is not None:
+            report = await loop.run_in_executor(
+                None, self.report_cache.load, sample_id, model
+            )
+            if report is not None:
+                return report
+
+        meta, body = await self._request_body(
+            "get", f"/samples/{sample_id}/overview.json"
+        )
+        report = await self._convert(model, meta, body)
+
+        if self.report_cache is None or isinstance(report, base.ErrorResponse):
+            return report
+
+        if fields is not None:
+            tasks_model = base.projected_model(
+                base.OverviewReport, frozenset(("tasks.status",))
+            )
+            tasks = tasks_model.model_validate_json(body)
+        else:
+            tasks = report
+
+        if self.report_cache.is_complete(tasks):
+            await loop.run_in_executor(None, self.report_cache.set, sample_id, body)
+
+        return report
+
+    async def sample_id(self, file_hash: str) -> str | None:
+        """Find the ID of a sample by the given hash, uses ``search`` under the hood.
+
+        Results (including hashes without a sample) are cached in
+        ``sample_id_cache``, so repeated lookups of a hash don't search again.
+
+        Parameters
+        ----------
+        file_hash : str
+            The hash (md5, sha1, sha2, ssdeep) of the file to get and ID for.
+
+        Returns
+        -------
+        str
+            The sample ID that was found for ``file_hash``.
+        None
+            The sample ID could not be found.
+        """
+
+        hash_prefix = utils.hash_type(file_hash)
+
+        if hash_prefix is None:
+            raise errors.PyHatchingValueError(
+                f"The input hash is not valid according to 'utils.hash_type': {file_hash}"
+            )
+
+        found, sample_id = await self._call_sample_id_cache(
+            self.sample_id_cache.get, file_hash
+        )
+        if found:
+            return sample_id
+
+        samples = await self.search(f"{hash_prefix}:{file_hash}")
 
         if isinstance(samples, base.ErrorResponse):
             return None
 
-        if len(samples) > 1:
-            # TODO There should only be one sample per hash right?
-            return samples[0].id
+        # TODO There should only be one sample per hash right?
+        sample_id = samples[0].id if samples else None
+        await self._call_sample_id_cache(self.sample_id_cache.set, file_hash, sample_id)
 
-        return None
+        return sample_id
+
+    async def _call_sample_id_cache(self, func: Callable, *args) -> Any:
+        """Call a ``sample_id_cache`` method, in an executor if the cache blocks."""
+
+        if not self.sample_id_cache.blocking:
+            return func(*args)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, func, *args)
+
+    async def overview_many(
+        self,
+        samples: Iterable[str] | AsyncIterable[str],
+        concurrency: int = 10,
+        fields: Iterable[str] | None = None,
+        resolve_batch: int = 500,
+    ) -> AsyncIterator[base.OverviewResult]:
+        """Fetch the overview reports of many samples, yielding each as it completes.
+
+        ``samples`` are read ``resolve_batch`` at a time, and the hashes in each
+        batch are resolved to sample IDs with a single ``resolve_many`` call
+        instead of a search each. The reports are then fetched with ``overview``,
+        at most ``concurrency`` at once. Only one batch of inputs and the reports
+        in flight are held in memory, so a large (or endless) async iterable can
+        be fed in directly.
+
+        An error raised for a single sample is captured on its result instead of
+        aborting the batch. Closing the returned generator early (for example,
+        by breaking out of the loop or cancelling the task consuming it) cancels
+        the fetches in flight, results already yielded are kept by the caller.
+
+        Parameters
+        ----------
+        samples : Iterable[str] | AsyncIterable[str]
+            The samples to get the overview report of, each can be any of the
+            following::
+
+                sample uuid, md5, sha1, sha2, ssdeep
+        concurrency : int, optional
+            The maximum number of reports fetched at once, by default 10.
+        fields : Iterable[str] | None, optional
+            Only build these fields of each report, see ``overview``.
+            By default None, the full reports are built.
+        resolve_batch : int, optional
+            The number of samples whose hashes are resolved together,
+            by default 500.
+
+        Yields
+        ------
+        base.OverviewResult
+            The input sample, its sample ID, and its report or error, and the
+            latency in seconds of fetching the report.
+
+        Raises
+        ------
+        PyHatchingValueError
+            If ``concurrency`` or ``resolve_batch`` is less than 1, or ``fields``
+            isn't valid.
+        """
+
+        if concurrency < 1:
+            raise errors.PyHatchingValueError(
+                f"concurrency must be a positive integer, not {concurrency}"
+            )
+        if resolve_batch < 1:
+            raise errors.PyHatchingValueError(
+                f"resolve_batch must be a positive integer, not {resolve_batch}"
+            )
+        if fields is not None:
+            fields = frozenset(fields)
+            try:
+                base.projected_model(base.OverviewReport, fields)
+            except ValueError as err:
+                raise errors.PyHatchingValueError(str(err)) from err
+
+        async def resolved() -> AsyncIterator[tuple[str, str | None, Exception | None]]:
+            """Yield each input with its sample ID (or the error resolving it)."""
+
+            batch = []
+            async for sample in utils.aiter_items(samples):
+                batch.append(sample)
+                if len(batch) < resolve_batch:
+                    continue
+                for item in await resolve(batch):
+                    yield item
+                batch = []
+            for item in await resolve(batch):
+                yield item
+
+        async def resolve(batch: list[str]):
+            hashes = [s for s in batch if utils.hash_type(s) is not None]
+            try:
+                sample_ids = await self.resolve_many(hashes) if hashes else {}
+            except Exception as err:  # pylint: disable=broad-except
+                return [(sample, None, err) for sample in batch]
+            return [(s, sample_ids.get(s, s), None) for s in batch]
+
+        async def fetch(item):
+            sample, sample_id, error = item
+            start = time.monotonic()
+            report = None
+            if error is None and sample_id is not None:
+                try:
+                    report = await self.overview(sample_id, fields)
+                except Exception as err:  # pylint: disable=broad-except
+                    error = err
+            return base.OverviewResult(
+                sample=sample,
+                sample_id=sample_id,
+                report=report,
+                error=error,
+                latency=time.monotonic() - start,
+            )
+
+        async for result in utils.bounded_as_completed(fetch, resolved(), concurrency):
+            yield result
+
+    async def resolve_many(
+        self,
+        hashes: Iterable[str],
+        concurrency: int = 4,
+        page_size: int = 100,
+        max_query_length: int = MAX_QUERY_LENGTH,
+    ) -> dict[str, str | None]:
+        """Find the sample IDs of many hashes using as few searches as possible.
+
+        Hashes are grouped by type and OR-ed together into queries of at most
+        ``max_query_length`` characters. The search results are matched back
+        to the hashes by their md5/sha1/sha256/sha512 fields. Any hash whose
+        result can't be told apart from the others in its query falls back to
+        ``sample_id``.
+
+        Cached lookups are answered from ``sample_id_cache``, and every new
+        result is added to it.
+
+        Parameters
+        ----------
+        hashes : Iterable[str]
+            The hashes (md5, sha1, sha2, sha512) to find sample IDs for.
+        concurrency : int, optional
+            The maximum number of searches in flight at once, by default 4.
+        page_size : int, optional
+            The number of samples to request per page of results, by default 100.
+        max_query_length : int, optional
+            The longest query to send, by default MAX_QUERY_LENGTH.
+
+        Returns
+        -------
+        dict[str, str | None]
+            Each given hash mapped to its sample ID, or None if it wasn't found
+            (or the API returned an error while searching for it).
+
+        Raises
+        ------
+        PyHatchingValueError
+            If any of ``hashes`` isn't a valid hash.
+        """
+
+        resolved, _ = await self._resolve_hashes(
+            hashes, concurrency, page_size, max_query_length
+        )
+        return resolved
+
+    async def _resolve_hashes(
+        self,
+        hashes: Iterable[str],
+        concurrency: int = 4,
+        page_size: int = 100,
+        max_query_length: int = MAX_QUERY_LENGTH,
+    ) -> tuple[dict[str, str | None], dict[str, base.ErrorResponse]]:
+        """``resolve_many``, also returning the API error of each failed search.
+
+        The second dict maps the hashes that weren't resolved because their
+        search returned an error to that error.
+        """
+
+        prefixes = {}
+        for file_hash in hashes:
+            if file_hash in prefixes:
+                continue
+
+            hash_prefix = utils.hash_type(file_hash)
+            if hash_prefix is None:
+                raise errors.PyHatchingValueError(
+                    f"The input hash is not valid according to 'utils.hash_type': {file_hash}"
+                )
+            prefixes[file_hash] = hash_prefix
+
+        cached = await self._call_sample_id_cache(
+            self.sample_id_cache.get_many, list(prefixes)
+        )
+
+        resolved = {}
+        failed = {}
+        groups: dict[str, list[str]] = {}
+        for file_hash, hash_prefix in prefixes.items():
+            found, sample_id = cached[file_hash]
+            resolved[file_hash] = sample_id
+            if not found:
+                groups.setdefault(hash_prefix, []).append(file_hash)
+
+        queries = (
+            (hash_prefix, chunk)
+            for hash_prefix, group in groups.items()
+            for chunk in utils.pack_terms(
+                [f"{hash_prefix}:{h}" for h in group], " OR ", max_query_length
+            )
+        )
+
+        async def resolve(query: tuple[str, list[str]]) -> list[str]:
+            """Run a combined query, returning the hashes it couldn't resolve."""
+
+            hash_prefix, terms = query
+            chunk = [term.split(":", 1)[1] for term in terms]
+
+            samples = []
+            async for page in self._search_pages(" OR ".join(terms), None, page_size):
+                if isinstance(page[0], base.ErrorResponse):
+                    failed.update(dict.fromkeys(chunk, page[0]))
+                    return []
+                samples.extend(page)
+
+            matches = {}
+            unmatched = False
+            for sample in samples:
+                value = getattr(sample, hash_prefix)
+                if value is None:
+                    unmatched = True
+                else:
+                    matches.setdefault(value.lower(), sample.id)
+
+            fallback = []
+            found = {}
+            for file_hash in chunk:
+                if file_hash.lower() in matches:
+                    sample_id = matches[file_hash.lower()]
+                elif len(chunk) == 1 and samples:
+                    sample_id = samples[0].id
+                elif unmatched:
+                    fallback.append(file_hash)
+                    continue
+                else:
+                    sample_id = None
+                found[file_hash] = sample_id
+
+            resolved.update(found)
+            await self._call_sample_id_cache(self.sample_id_cache.set_many, found)
+
+            return fallback
+
+        fallback = []
+        async for unresolved in utils.bounded_as_completed(
+            resolve, queries, concurrency
+        ):
+            fallback.extend(unresolved)
+
+        async def resolve_one(file_hash: str):
+            resolved[file_hash] = await self.sample_id(file_hash)
+
+        async for _ in utils.bounded_as_completed(resolve_one, fallback, concurrency):
+            pass
+
+        return resolved, failed
+
+    async def _search_page(
+        self, query: str, limit: int | None = None, offset: str | None = None
+    ) -> tuple[base.ResponseMeta, bytes]:
+        """Request a single page of ``/search`` results."""
+
+        params = {"query": query}
+        if limit is not None:
+            params["limit"] = limit
+        if offset is not None:
+            params["offset"] = offset
+
+        return await self._request_body("get", "/search", params=params)
 
     async def search(
         self, query: str
@@ -550,7 +2306,8 @@ class PyHatchingClient:
 
         See the Hatching Triage `docs`_ for how to search.
 
-        Does not handle pagination yet, returns only the first 20 hits!
+        Returns only the first page of hits (20 by default), use ``search_iter``
+        to follow the pagination cursor through the whole result set.
 
         Parameters
         ----------
@@ -566,12 +2323,115 @@ class PyHatchingClient:
         .. _docs: https://tria.ge/docs/cloud-api/search/
         """
 
-        # TODO Handle pagination
-        params = {"query": query}
+        meta, body = await self._search_page(query)
 
-        resp, resp_dict = await self._request("get", "/search", params=params)
+        return await self._convert(base.SamplesResponse, meta, body)
 
-        return self.convert_resp(base.SamplesResponse, resp, resp_dict)
+    async def search_iter(
+        self,
+        query: str,
+        limit: int | None = None,
+        page_size: int = 20,
+        prefetch: int = 1,
+    ) -> AsyncIterator[base.SamplesResponse | base.ErrorResponse]:
+        """Iterate over every sample matching ``query``, one page at a time.
+
+        Follows the ``next`` cursor returned by the API. While the caller works
+        through the current page, up to ``prefetch`` further pages are requested
+        in the background so the next page is usually ready when it's needed.
+        Only the current and prefetched pages are ever held in memory.
+
+        Parameters
+        ----------
+        query : str
+            The query string to search for.
+        limit : int | None, optional
+            Stop after yielding this many samples, by default None (no limit).
+        page_size : int, optional
+            The number of samples to request per page, by default 20.
+        prefetch : int, optional
+            The number of pages to fetch ahead of the consumer, by default 1.
+            Set to 0 to only request a page once the previous one is exhausted.
+
+        Yields
+        ------
+        base.SamplesResponse
+            Each sample matching ``query``.
+        base.ErrorResponse
+            If the API returns an error, it is yielded as the final item.
+
+        Raises
+        ------
+        PyHatchingValueError
+            If ``page_size`` is not positive or ``prefetch`` is negative.
+        """
+
+        if page_size < 1:
+            raise errors.PyHatchingValueError(
+                f"page_size must be a positive integer, not {page_size}"
+            )
+        if prefetch < 0:
+            raise errors.PyHatchingValueError(
+                f"prefetch must not be negative, not {prefetch}"
+            )
+
+        if not prefetch:
+            async for page in self._search_pages(query, limit, page_size):
+                for sample in page:
+                    yield sample
+            return
+
+        # Holds pages of samples, the exception raised while fetching a page,
+        # or None to mark the end of the results.
+        pages = asyncio.Queue(maxsize=prefetch)
+
+        async def fetch_pages():
+            try:
+                async for page in self._search_pages(query, limit, page_size):
+                    await pages.put(page)
+            except Exception as err:  # pylint: disable=broad-except
+                await pages.put(err)
+            await pages.put(None)
+
+        producer = asyncio.create_task(fetch_pages())
+        try:
+            while (page := await pages.get()) is not None:
+                if isinstance(page, Exception):
+                    raise page
+                for sample in page:
+                    yield sample
+        finally:
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+
+    async def _search_pages(
+        self, query: str, limit: int | None, page_size: int
+    ) -> AsyncIterator[list[base.SamplesResponse] | list[base.ErrorResponse]]:
+        """Request pages of ``/search`` results until the cursor runs out.
+
+        An ``ErrorResponse`` is yielded as a single item page and ends the iteration.
+        """
+
+        offset = None
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = page_size if remaining is None else min(page_size, remaining)
+            meta, body = await self._search_page(query, size, offset)
+            page = await self._convert(base.SamplesResponse, meta, body)
+
+            if isinstance(page, base.ErrorResponse):
+                yield [page]
+                return
+
+            offset = page.next
+            if remaining is not None:
+                page = page[:remaining]
+                remaining -= len(page)
+            if page:
+                yield page
+
+            if not offset or not page:
+                return
 
     async def submit_profile(
         self,
@@ -646,7 +2506,7 @@ class PyHatchingClient:
     async def _submit_sample(
         self,
         json: dict | None = None,
-        data: aiohttp.MultipartWriter | None = None,
+        data: Callable[[], aiohttp.MultipartWriter] | None = None,
     ):
         """Actually make the submit sample HTTP request."""
 
@@ -659,43 +2519,64 @@ class PyHatchingClient:
     ):
         """Submit a file hosted at a URL for the sandbox to download and analyze."""
 
-        return await self._submit_sample(json=submit_req.dict(exclude_none=True))
+        return await self._submit_sample(
+            json=submit_req.model_dump(mode="json", exclude_none=True)
+        )
 
     async def _submit_file(
         self,
         submit_req: base.SubmissionRequest,
         sample: bytes | pathlib.Path | str,
+        chunk_size: int = CHUNK_SIZE,
     ):
-        """Submit a file to the sandbox for analysis."""
+        """Submit a file to the sandbox for analysis.
 
-        mpwriter = aiohttp.MultipartWriter()
+        The file is streamed from disk (or from the given bytes) without making
+        a copy of it, its md5 and sha256 are computed as it's sent.
+        """
 
         if isinstance(sample, bytes):
-            fpart = mpwriter.append(sample)
-
             if not submit_req.target:
                 fhash = hashlib.md5(sample).hexdigest()
                 raise errors.PyHatchingValueError(
                     f"Must specify a filename when passing submitting bytes ({fhash})"
                 )
+            filename = submit_req.target
+        else:
+            filename = submit_req.target or os.path.basename(sample)
+
+        try:
+            reader = utils.HashingChunkReader(sample, chunk_size)
+        except OSError as err:
+            raise errors.PyHatchingFileError(f"Unable to read {sample}: {err}") from err
+
+        def build_form() -> aiohttp.MultipartWriter:
+            mpwriter = aiohttp.MultipartWriter("form-data")
 
-            fpart.set_content_disposition(
-                "form-data", name="file", filename=submit_req.target
+            fpart = mpwriter.append(reader)
+            fpart.set_content_disposition("form-data", name="file", filename=filename)
+
+            jpart = mpwriter.append(
+                self.json_codec.dumps(
+                    submit_req.model_dump(mode="json", exclude_none=True)
+                )
             )
+            jpart.set_content_disposition("form-data", name="_json")
 
-        else:
-            try:
-                with open(sample, "rb") as fd:
-                    mpwriter.append(fd)
-            except OSError as err:
-                raise errors.PyHatchingFileError(
-                    f"Unable to read {sample}: {err}"
-                ) from err
+            return mpwriter
+
+        with reader:
+            resp, resp_dict = await self._submit_sample(data=build_form)
 
-        jpart = mpwriter.append(submit_req.json(exclude_none=True))
-        jpart.set_content_disposition("form-data", name="_json")
+        log.debug(
+            "Submitted %s (%d bytes, md5: %s, sha256: %s)",
+            filename,
+            reader.size,
+            reader.md5,
+            reader.sha256,
+        )
 
-        return await self._submit_sample(data=mpwriter)
+        return resp, resp_dict
 
     async def _submit_url(self, url: str):
         """Submit a url to the sandbox for analysis."""
@@ -706,6 +2587,7 @@ class PyHatchingClient:
         self,
         submit_req: base.SubmissionRequest,
         sample: bytes | pathlib.Path | str | None,
+        chunk_size: int = CHUNK_SIZE,
     ) -> base.SamplesResponse | base.ErrorResponse:
         """Submit a sample to the sandbox based on the given ``SubmissionRequest``.
 
@@ -715,6 +2597,9 @@ class PyHatchingClient:
             The object used to make the request - see this object for details.
         sample : bytes | pathlib.Path | str
             The local file path, url, or raw bytes, to submit to the sandbox.
+        chunk_size : int, optional
+            The number of bytes of a file submission to read and send at a time,
+            by default CHUNK_SIZE. Files are never fully read into memory.
 
         Returns
         -------
@@ -724,25 +2609,250 @@ class PyHatchingClient:
             If the API reports an error with the submission.
         """
 
-        if submit_req.kind == "file":
+        if submit_req.kind == enums.SubmissionKinds.FILE:
             if sample is None:
                 raise errors.PyHatchingValueError(
                     "No file specified for file based submission."
                 )
-            path = os.path.expandvars(os.path.expanduser(sample))
-            resp, resp_dict = await self._submit_file(submit_req, path)
+            if not isinstance(sample, bytes):
+                sample = os.path.expandvars(os.path.expanduser(sample))
+            resp, resp_dict = await self._submit_file(submit_req, sample, chunk_size)
         else:
             if submit_req.url is None:
                 raise errors.PyHatchingValueError(
                     "No URL specified for url based submission."
                 )
-            if submit_req.kind == "url":
+            if submit_req.kind == enums.SubmissionKinds.URL:
                 resp, resp_dict = await self._submit_url(submit_req.url)
-            elif submit_req.kind == "fetch":
+            elif submit_req.kind == enums.SubmissionKinds.FETCH:
                 resp, resp_dict = await self._submit_fetch(submit_req)
 
         return self.convert_resp(base.SamplesResponse, resp, resp_dict)
 
+    async def submit_many(
+        self,
+        requests: Iterable[tuple[base.SubmissionRequest, bytes | pathlib.Path | str | None]]
+        | AsyncIterable[
+            tuple[base.SubmissionRequest, bytes | pathlib.Path | str | None]
+        ],
+        concurrency: int = 10,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> AsyncIterator[base.SubmitResult]:
+        """Submit many samples at once, yielding each result as it completes.
+
+        Each pair is submitted with ``submit_sample``, with at most ``concurrency``
+        submissions in flight. Pairs are only pulled from ``requests`` when a slot
+        frees up, so a large (or endless) async iterable can be fed in directly.
+
+        An error raised by a single submission is captured on its result instead
+        of aborting the batch.
+
+        Parameters
+        ----------
+        requests : Iterable | AsyncIterable
+            ``(SubmissionRequest, sample)`` pairs, the same arguments passed to
+            ``submit_sample``.
+        concurrency : int, optional
+            The maximum number of submissions in flight at once, by default 10.
+        chunk_size : int, optional
+            The number of bytes of a file submission to read and send at a time,
+            by default CHUNK_SIZE.
+
+        Yields
+        ------
+        base.SubmitResult
+            The response or error, and the latency in seconds, of each submission.
+
+        Raises
+        ------
+        PyHatchingValueError
+            If ``concurrency`` is less than 1.
+        """
+
+        if concurrency < 1:
+            raise errors.PyHatchingValueError(
+                f"concurrency must be a positive integer, not {concurrency}"
+            )
+
+        async def submit(pair):
+            submit_req, sample = pair
+            start = time.monotonic()
+            try:
+                resp = await self.submit_sample(submit_req, sample, chunk_size)
+            except Exception as err:  # pylint: disable=broad-except
+                return base.SubmitResult(
+                    request=submit_req,
+                    sample=sample,
+                    error=err,
+                    latency=time.monotonic() - start,
+                )
+            return base.SubmitResult(
+                request=submit_req,
+                sample=sample,
+                response=resp,
+                latency=time.monotonic() - start,
+            )
+
+        async for result in utils.bounded_as_completed(submit, requests, concurrency):
+            yield result
+
+    async def static_report(
+        self, sample: str
+    ) -> base.StaticReport | base.ErrorResponse | None:
+        """Return a sample's static analysis report.
+
+        Parameters
+        ----------
+        sample : str
+            The sample to get the report of, this can be any of the following
+            as the value is passed to ``sample_id`` if needed to find the ID::
+
+                sample uuid, md5, sha1, sha2, ssdeep
+
+        Returns
+        -------
+        base.StaticReport
+            If successful, the static report.
+        base.ErrorResponse
+            If there was an error.
+        None
+            If the sample is not found.
+        """
+
+        sample_id = await self.norm_sample(sample)
+        if sample_id is None:
+            return None
+
+        meta, body = await self._request_body(
+            "get", f"/samples/{sample_id}/reports/static"
+        )
+
+        return await self._convert(base.StaticReport, meta, body)
+
+    async def triage_report(
+        self, sample: str, task: str, fields: Iterable[str] | None = None
+    ) -> base.TriageReport | base.ErrorResponse | None:
+        """Return the report of one of a sample's dynamic analysis tasks.
+
+        Parameters
+        ----------
+        sample : str
+            The sample to get the report of, this can be any of the following
+            as the value is passed to ``sample_id`` if needed to find the ID::
+
+                sample uuid, md5, sha1, sha2, ssdeep
+        task : str
+            The name of the task, for example ``behavioral1``.
+        fields : Iterable[str] | None, optional
+            Only build these fields of the report, see ``base.projected_model``.
+            By default None, the full report is built.
+
+        Returns
+        -------
+        base.TriageReport
+            If successful, the task's report. A projection of it if ``fields``
+            is set.
+        base.ErrorResponse
+            If there was an error.
+        None
+            If the sample is not found.
+        """
+
+        model = base.TriageReport
+        if fields is not None:
+            try:
+                model = base.projected_model(model, frozenset(fields))
+            except ValueError as err:
+                raise errors.PyHatchingValueError(str(err)) from err
+
+        sample_id = await self.norm_sample(sample)
+        if sample_id is None:
+            return None
+
+        meta, body = await self._request_body(
+            "get", f"/samples/{sample_id}/{task}/report_triage.json"
+        )
+
+        return await self._convert(model, meta, body)
+
+    async def task_reports(
+        self, sample: str, concurrency: int = 4
+    ) -> AsyncIterator[base.TaskReportResult | base.ErrorResponse]:
+        """Fetch the report of every task of a sample, yielding each as it arrives.
+
+        The tasks are read from the sample's overview report (``tasks`` and
+        ``targets[].tasks``). Static tasks share the sample's single static
+        report, every other task's report is fetched with ``triage_report``.
+        At most ``concurrency`` reports are fetched at once, and a slow task
+        doesn't hold up the others.
+
+        An error raised while fetching a single report is captured on its result
+        instead of aborting the rest.
+
+        Parameters
+        ----------
+        sample : str
+            The sample to get the reports of, this can be any of the following
+            as the value is passed to ``sample_id`` if needed to find the ID::
+
+                sample uuid, md5, sha1, sha2, ssdeep
+        concurrency : int, optional
+            The maximum number of reports fetched at once, by default 4.
+
+        Yields
+        ------
+        base.TaskReportResult
+            The report or error, and the latency in seconds, of each task.
+        base.ErrorResponse
+            If the API returns an error for the overview report, it is the
+            only item yielded.
+
+        Raises
+        ------
+        PyHatchingValueError
+            If ``concurrency`` is less than 1.
+        """
+
+        if concurrency < 1:
+            raise errors.PyHatchingValueError(
+                f"concurrency must be a positive integer, not {concurrency}"
+            )
+
+        sample_id = await self.norm_sample(sample)
+        if sample_id is None:
+            return
+
+        overview = await self.overview(sample_id, fields=("tasks", "targets.tasks"))
+        if isinstance(overview, base.ErrorResponse):
+            yield overview
+            return
+
+        tasks = []
+        for name in _task_names(sample_id, overview):
+            if name.startswith("static"):
+                if "static" not in tasks:
+                    tasks.append("static")
+            else:
+                tasks.append(name)
+
+        async def fetch(task):
+            start = time.monotonic()
+            try:
+                if task == "static":
+                    report = await self.static_report(sample_id)
+                else:
+                    report = await self.triage_report(sample_id, task)
+            except Exception as err:  # pylint: disable=broad-except
+                return base.TaskReportResult(
+                    task=task, error=err, latency=time.monotonic() - start
+                )
+            return base.TaskReportResult(
+                task=task, report=report, latency=time.monotonic() - start
+            )
+
+        async for result in utils.bounded_as_completed(fetch, tasks, concurrency):
+            yield result
+
     async def update_profile(
         self,
         tags: list[str],
@@ -809,3 +2919,280 @@ class PyHatchingClient:
         """
 
         return await self._write_rule("put", name, contents)
+
+    async def wait_for_reports(
+        self,
+        sample_ids: Iterable[str],
+        concurrency: int = 10,
+        schedule: poll.PollSchedule | None = None,
+        use_events: bool = False,
+        max_failures: int = 5,
+    ) -> AsyncIterator[base.SampleInfo | base.ErrorResponse]:
+        """Wait for many samples to finish, yielding each one as it does.
+
+        A sample has finished once its status is one of ``enums.CompleteStatuses``.
+        All samples share a single scheduler - a queue ordered by when each
+        sample is next due to be checked - and at most ``concurrency`` status
+        checks are in flight at once, however many samples are outstanding.
+        How long a sample waits between checks depends on its status, see
+        ``poll.PollSchedule``.
+
+        A status check that fails with a request error (after ``retry_policy``'s
+        retries) doesn't end the wait, the sample is checked again with backoff
+        and ``on_retry`` is called with the error, up to ``max_failures`` times
+        in a row.
+
+        Parameters
+        ----------
+        sample_ids : Iterable[str]
+            The samples to wait on, this can be any of the following
+            as the value is passed to ``sample_id`` if needed to find the ID::
+
+                sample uuid, md5, sha1, sha2, ssdeep
+        concurrency : int, optional
+            The maximum number of status checks in flight at once, by default 10.
+        schedule : poll.PollSchedule | None, optional
+            How long to wait between checks of a sample, by default None,
+            a ``PollSchedule`` with its defaults is used.
+        use_events : bool, optional
+            Instead of polling, check each sample once and then wait for the
+            rest to finish on the ``events`` stream of all your samples, by
+            default False.
+        max_failures : int, optional
+            The most status checks of a sample in a row that may fail with a
+            request error before the wait ends, by default 5.
+
+        Yields
+        ------
+        base.SampleInfo
+            Each sample once it has finished, in the order they finish.
+        base.ErrorResponse
+            If the API returns an error for a sample, which is no longer checked.
+            This is yielded even if the client raises on API errors.
+
+        Raises
+        ------
+        PyHatchingValueError
+            If ``concurrency`` or ``max_failures`` is less than 1, or a hash in
+            ``sample_ids`` has no sample. Hashes are all resolved with ``resolve_many`` before waiting.
+        PyHatchingApiError
+            If the API returns an error while resolving the hashes.
+        PyHatchingRequestError
+            If a sample's status checks fail ``max_failures`` times in a row.
+        PyHatchingError
+            If a status check fails with any other error, such as a response
+            that can't be parsed or validated.
+        """
+
+        if concurrency < 1:
+            raise errors.PyHatchingValueError(
+                f"concurrency must be a positive integer, not {concurrency}"
+            )
+
+        if max_failures < 1:
+            raise errors.PyHatchingValueError(
+                f"max_failures must be a positive integer, not {max_failures}"
+            )
+
+        sample_ids = await self._resolve_ids(sample_ids)
+
+        if use_events:
+            async for info in self._wait_for_events(
+                sample_ids, concurrency, max_failures
+            ):
+                yield info
+            return
+
+        schedule = schedule or poll.PollSchedule()
+        complete = {s.value for s in enums.CompleteStatuses}
+        order = itertools.count()
+
+        # (due time, tie breaker, sample, last status, checks with that status,
+        # failed checks in a row)
+        now = time.monotonic()
+        due = [(now, next(order), sample, None, 0, 0) for sample in sample_ids]
+        heapq.heapify(due)
+        checking: dict[asyncio.Task, tuple] = {}
+
+        try:
+            while due or checking:
+                now = time.monotonic()
+                while due and due[0][0] <= now and len(checking) < concurrency:
+                    entry = heapq.heappop(due)
+                    checking[asyncio.create_task(self.get_sample(entry[2]))] = entry
+
+                timeout = None
+                if due and len(checking) < concurrency:
+                    timeout = max(due[0][0] - now, 0)
+                if not checking:
+                    await asyncio.sleep(timeout)
+                    continue
+
+                done, _ = await asyncio.wait(
+                    checking, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    _, _, sample, last_status, unchanged, failures = checking.pop(task)
+                    try:
+                        info = task.result()
+                    except errors.PyHatchingError as err:
+                        failures += 1
+                        info = _failed_check(err, failures, max_failures)
+                        if info is not None:
+                            yield info
+                            continue
+                        delay = min(
+                            self.retry_policy.delay(failures), schedule.max_interval
+                        )
+                        if self.on_retry is not None:
+                            self.on_retry(
+                                "get", f"/samples/{sample}", failures, delay, err
+                            )
+                        heapq.heappush(
+                            due,
+                            (
+                                time.monotonic() + delay,
+                                next(order),
+                                sample,
+                                last_status,
+                                unchanged,
+                                failures,
+                            ),
+                        )
+                        continue
+
+                    if (
+                        isinstance(info, base.ErrorResponse)
+                        or info.status.value in complete
+                    ):
+                        yield info
+                        continue
+
+                    unchanged = unchanged + 1 if info.status == last_status else 0
+                    heapq.heappush(
+                        due,
+                        (
+                            time.monotonic() + schedule.delay(info.status, unchanged),
+                            next(order),
+                            sample,
+                            info.status,
+                            unchanged,
+                            0,
+                        ),
+                    )
+        finally:
+            for task in checking:
+                task.cancel()
+            await asyncio.gather(*checking, return_exceptions=True)
+
+    async def _resolve_ids(self, samples: Iterable[str]) -> list[str]:
+        """Resolve any hashes in ``samples`` to sample IDs, in one go.
+
+        Raises ``PyHatchingValueError`` naming the hashes that have no sample,
+        or ``PyHatchingApiError`` if searching for any of them returned an error.
+        """
+
+        samples = list(samples)
+        hashes = [s for s in samples if utils.hash_type(s) is not None]
+        if not hashes:
+            return samples
+
+        resolved, failed = await self._resolve_hashes(hashes)
+        if failed:
+            file_hash, err = next(iter(failed.items()))
+            raise errors.PyHatchingApiError(
+                f"Hatching Triage API Error searching for {file_hash} - {err.error}"
+                f" - {err.message}",
+                response=err,
+            )
+        missing = [h for h in hashes if resolved[h] is None]
+        if missing:
+            shown = ", ".join(missing[:10])
+            raise errors.PyHatchingValueError(
+                f"No sample found for {len(missing)} hash(es): {shown}"
+            )
+        return [resolved.get(s, s) for s in samples]
+
+    async def _wait_for_events(
+        self,
+        sample_ids: Iterable[str],
+        concurrency: int,
+        max_failures: int,
+        max_reconnects: int = 5,
+    ) -> AsyncIterator[base.SampleInfo | base.ErrorResponse]:
+        """Yield samples as they finish, as seen by the ``events`` stream.
+
+        The stream is opened before each sample is checked once, so a sample
+        that finishes in between isn't missed.
+        """
+
+        complete = {s.value for s in enums.CompleteStatuses}
+        remaining = set(sample_ids)
+        connected = asyncio.Event()
+        # Holds finished samples, (sample ID, ErrorResponse) pairs, or exceptions.
+        finished = asyncio.Queue()
+
+        async def listen():
+            try:
+                async for info in self._events(
+                    "/samples/events", False, max_reconnects, connected
+                ):
+                    if isinstance(info, base.ErrorResponse):
+                        await finished.put(
+                            errors.PyHatchingApiError(
+                                f"Hatching Triage API Error - {info.error} - {info.message}"
+                            )
+                        )
+                        return
+                    if info.status.value in complete:
+                        await finished.put(info)
+            except Exception as err:  # pylint: disable=broad-except
+                await finished.put(err)
+
+        async def check_one(sample_id):
+            failures = 0
+            while True:
+                try:
+                    return sample_id, await self.get_sample(sample_id)
+                except errors.PyHatchingError as err:
+                    failures += 1
+                    info = _failed_check(err, failures, max_failures)
+                    if info is not None:
+                        return sample_id, info
+                    delay = self.retry_policy.delay(failures)
+                    if self.on_retry is not None:
+                        self.on_retry(
+                            "get", f"/samples/{sample_id}", failures, delay, err
+                        )
+                    await asyncio.sleep(delay)
+
+        async def check():
+            await connected.wait()
+            try:
+                async for sample_id, info in utils.bounded_as_completed(
+                    check_one, list(remaining), concurrency
+                ):
+                    if isinstance(info, base.ErrorResponse):
+                        await finished.put((sample_id, info))
+                    elif info.status.value in complete:
+                        await finished.put(info)
+            except Exception as err:  # pylint: disable=broad-except
+                await finished.put(err)
+
+        tasks = [asyncio.create_task(listen()), asyncio.create_task(check())]
+        try:
+            while remaining:
+                item = await finished.get()
+                if isinstance(item, Exception):
+                    raise item
+                if isinstance(item, tuple):
+                    sample_id, item = item
+                else:
+                    sample_id = item.id
+                if sample_id in remaining:
+                    remaining.discard(sample_id)
+                    yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -1,6 +1,8 @@
 """Commands for the main func to dispatch."""
 
 import json
+import pathlib
+
 from pydantic import ValidationError
 
 from . import PyHatchingClient
@@ -47,10 +49,12 @@ async def do_samples(client: PyHatchingClient, args):
     """Handle the samples command."""
 
     if args.action == "download":
-        sample_bytes = await client.download_sample(args.sample)
-        if sample_bytes:
-            with open(args.path, "wb") as fd:
-                fd.write(sample_bytes)
+        path = args.path if args.path else pathlib.Path(args.sample)
+        if path.is_dir():
+            path = path / args.sample
+        result = await client.download_sample_to(args.sample, path)
+        if result:
+            print(f"Wrote {result.size} bytes to {path} (sha256: {result.sha256})")
         else:
             print(f"No bytes found for {args.sample}")
 
@@ -1,17 +1,68 @@
 """Types for pyhatching."""
 
+import dataclasses
 import datetime
-from typing import Any, Optional
+import functools
+import types
+import typing
+from typing import Any, Generic, Optional, TypeVar
 
-from pydantic import BaseModel, ConfigDict, Field  # pylint: disable=E0611
+from pydantic import BaseModel, ConfigDict, Field, create_model  # pylint: disable=E0611
 
 from . import enums
 
 
+ModelT = TypeVar("ModelT")
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class ResponseMeta:
+    """What's kept of the HTTP response a ``HatchingResponse`` was built from.
+
+    ``raw`` is the ``aiohttp.ClientResponse`` itself, only kept when the client
+    was created with ``keep_response=True``. ``elapsed`` is None when it
+    wasn't measured.
+
+    For bodies the client reads whole, ``wire_bytes`` is the size of the body
+    as sent (0 for a ``304 Not Modified``), ``body_bytes`` its size once decoded
+    from ``content_encoding``, and ``decode_time`` the seconds decoding took.
+    """
+
+    status: int
+    url: str
+    elapsed: Optional[float] = None
+    rate_limit_remaining: Optional[int] = None
+    rate_limit_reset: Optional[float] = None
+    request_id: Optional[str] = None
+    raw: Any = None
+    content_encoding: Optional[str] = None
+    wire_bytes: Optional[int] = None
+    body_bytes: Optional[int] = None
+    decode_time: Optional[float] = None
+
+
 class HatchingResponse(BaseModel):
     """A response from the Hatching Triage API."""
 
-    resp_obj: Any = None
+    resp_obj: Optional[ResponseMeta] = None
+
+
+class DataEnvelope(BaseModel, Generic[ModelT]):
+    """The ``{"data": [...], "next": ...}`` envelope of list endpoints."""
+
+    data: list[ModelT]
+    next: Optional[str] = None
+
+
+class ResultsPage(list):
+    """A page of results from a list endpoint.
+
+    ``next`` is the cursor of the following page, or None on the last page.
+    """
+
+    def __init__(self, items=(), next: str | None = None) -> None:  # pylint: disable=W0622
+        super().__init__(items)
+        self.next = next
 
 
 class ErrorResponse(HatchingResponse):
@@ -31,6 +82,10 @@ class SampleInfo(HatchingResponse):
     submitted: datetime.datetime
     filename: Optional[str] = None
     url: Optional[str] = None
+    md5: Optional[str] = None
+    sha1: Optional[str] = None
+    sha256: Optional[str] = None
+    sha512: Optional[str] = None
 
 
 class SamplesResponse(SampleInfo):
@@ -39,6 +94,19 @@ class SamplesResponse(SampleInfo):
     completed: datetime.datetime
 
 
+class DownloadResult(BaseModel):
+    """The outcome of streaming a download to disk or a file object.
+
+    ``resumed`` is the number of bytes that didn't have to be downloaded again
+    because an interrupted download was resumed.
+    """
+
+    size: int
+    sha256: str
+    path: Optional[str] = None
+    resumed: int = 0
+
+
 class YaraRule(BaseModel):
     """A yara rule."""
 
@@ -310,10 +378,9 @@ class OverviewTarget(BaseModel):
     iocs: Optional[OverviewIOCs] = None
 
 
-class OverviewExtracted(BaseModel):
-    """Collection of data extracted during analysis."""
+class Extract(BaseModel):
+    """Data extracted during analysis."""
 
-    tasks: list[str]
     dumped_file: Optional[str] = None
     resource: Optional[str] = None
     config: Optional[Config] = None
@@ -323,6 +390,12 @@ class OverviewExtracted(BaseModel):
     credentials: Optional[Credentials] = None
 
 
+class OverviewExtracted(Extract):
+    """Collection of data extracted during analysis."""
+
+    tasks: list[str]
+
+
 class OverviewSample(BaseModel):
     """Information on the analyzed sample, very similar to OverviewTarget but w/o tasks."""
 
@@ -355,3 +428,277 @@ class OverviewReport(HatchingResponse):
     errors: Optional[list[ReportedFailure]] = None
     signatures: Optional[list[Signature]] = None
     extracted: Optional[list[OverviewExtracted]] = None
+
+
+class ReportAnalysis(BaseModel):
+    """The analysis summary of a single task."""
+
+    score: Optional[int] = None
+    family: Optional[list[str]] = None
+    tags: Optional[list[str]] = None
+    ttp: Optional[list[str]] = None
+    features: Optional[list[str]] = None
+    submitted: Optional[datetime.datetime] = None
+    reported: Optional[datetime.datetime] = None
+    max_time: Optional[int] = None
+    sequence: Optional[int] = None
+    platform: Optional[str] = None
+    resource: Optional[str] = None
+
+
+class Process(BaseModel):
+    """A process observed during a dynamic analysis task."""
+
+    procid: Optional[int] = None
+    procid_parent: Optional[int] = None
+    pid: Optional[int] = None
+    ppid: Optional[int] = None
+    cmd: Any = None
+    image: Optional[str] = None
+    orig: Optional[bool] = None
+    started: Optional[int] = None
+    terminated: Optional[int] = None
+
+
+class Dump(BaseModel):
+    """A file or memory region dumped during a dynamic analysis task."""
+
+    at: Optional[int] = None
+    pid: Optional[int] = None
+    procid: Optional[int] = None
+    path: Optional[str] = None
+    name: Optional[str] = None
+    kind: Optional[str] = None
+    addr: Optional[int] = None
+    size: Optional[int] = None
+    md5: Optional[str] = None
+    sha1: Optional[str] = None
+    sha256: Optional[str] = None
+    sha512: Optional[str] = None
+
+
+class TriageReport(HatchingResponse):
+    """The report of a single dynamic analysis (behavioral) task."""
+
+    version: str
+    sample: TargetDesc
+    task: TargetDesc
+    analysis: ReportAnalysis
+    processes: Optional[list[Process]] = None
+    signatures: Optional[list[Signature]] = None
+    network: Optional[dict] = None
+    dumped: Optional[list[Dump]] = None
+    extracted: Optional[list[Extract]] = None
+    errors: Optional[list[ReportedFailure]] = None
+
+
+class StaticFile(BaseModel):
+    """A file found during static analysis, the sample itself or one it contains."""
+
+    filename: Optional[str] = None
+    filesize: Optional[int] = None
+    md5: Optional[str] = None
+    sha1: Optional[str] = None
+    sha256: Optional[str] = None
+    sha512: Optional[str] = None
+    kind: Optional[str] = None
+    depth: Optional[int] = None
+    selected: Optional[bool] = None
+    tags: Optional[list[str]] = None
+    exts: Optional[list[str]] = None
+    password: Optional[str] = None
+    error: Optional[str] = None
+
+
+class StaticReport(HatchingResponse):
+    """The static analysis report of a sample."""
+
+    version: str
+    sample: Optional[dict] = None
+    task: Optional[dict] = None
+    analysis: Optional[ReportAnalysis] = None
+    files: Optional[list[StaticFile]] = None
+    unpack_count: Optional[int] = None
+    error_count: Optional[int] = None
+    signatures: Optional[list[Signature]] = None
+    extracted: Optional[list[Extract]] = None
+    errors: Optional[list[ReportedFailure]] = None
+
+
+class LogEvent(BaseModel):
+    """A single event from a task's kernel monitor log (e.g. ``onemon.json``)."""
+
+    kind: str
+    event: Any = None
+
+
+class ArtifactResult(BaseModel):
+    """The outcome of downloading a single artifact in ``download_artifacts``.
+
+    ``result`` is None if the artifact wasn't found, ``error`` is set instead
+    if downloading it failed.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    kind: enums.ArtifactKinds
+    task: str
+    name: str
+    result: Optional[DownloadResult] = None
+    error: Optional[Exception] = None
+    latency: float
+
+
+class OverviewResult(BaseModel):
+    """The outcome of fetching a single overview report in ``overview_many``.
+
+    ``report`` is None if the sample wasn't found, ``error`` is set instead
+    if fetching it failed.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    sample: str
+    sample_id: Optional[str] = None
+    report: Optional[HatchingResponse] = None
+    error: Optional[Exception] = None
+    latency: float
+
+
+class TaskReportResult(BaseModel):
+    """The outcome of fetching a single task's report in ``task_reports``.
+
+    Exactly one of ``report`` and ``error`` is set.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    task: str
+    report: Optional[TriageReport | StaticReport | ErrorResponse] = None
+    error: Optional[Exception] = None
+    latency: float
+
+
+class SubmitResult(BaseModel):
+    """The outcome of a single submission made by ``PyHatchingClient.submit_many``.
+
+    Exactly one of ``response`` and ``error`` is set.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    request: SubmissionRequest
+    sample: Any = None
+    response: Optional[SamplesResponse | ErrorResponse] = None
+    error: Optional[Exception] = None
+    latency: float
+
+
+def _replace_model(annotation: Any, old: type, new: type) -> Any:
+    """Replace ``old`` with ``new`` in a (possibly nested) type annotation."""
+
+    if annotation is old:
+        return new
+
+    args = typing.get_args(annotation)
+    if not args:
+        return annotation
+
+    args = tuple(_replace_model(arg, old, new) for arg in args)
+    origin = typing.get_origin(annotation)
+    if origin in (typing.Union, types.UnionType):
+        return typing.Union[args]
+    return origin[args]
+
+
+def _inner_model(annotation: Any) -> type[BaseModel] | None:
+    """Find the model in an annotation like ``Optional[list[Model]]``."""
+
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for arg in typing.get_args(annotation):
+        if (inner := _inner_model(arg)) is not None:
+            return inner
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def projected_model(model: type[BaseModel], fields: frozenset[str]) -> type[BaseModel]:
+    """Build (once) a copy of ``model`` with only the given fields.
+
+    Use dots to select fields of nested models, for example
+    ``{"analysis", "sample.sha256"}`` keeps all of ``analysis`` but only the
+    ``sha256`` of ``sample``. Every other field in the data is skipped when
+    validating, so none of its nested models are built.
+
+    Parameters
+    ----------
+    model : type[BaseModel]
+        The model to project.
+    fields : frozenset[str]
+        The (dotted) names of the fields to keep.
+
+    Returns
+    -------
+    type[BaseModel]
+        The projected model, a ``HatchingResponse`` if ``model`` is one.
+        Its ``__projection__`` is ``(model, fields)``, and its instances can be
+        pickled (to and from a process pool) even though the class can't be
+        imported by name.
+
+    Raises
+    ------
+    ValueError
+        If a field doesn't exist, or a dotted field isn't a model.
+    """
+
+    selected: dict[str, set[str] | None] = {}
+    for field in fields:
+        name, _, rest = field.partition(".")
+        if name not in model.model_fields:
+            raise ValueError(f"{model.__name__} has no field {name!r}")
+        if not rest:
+            selected[name] = None
+        elif selected.get(name, set()) is not None:
+            selected.setdefault(name, set()).add(rest)
+
+    definitions = {}
+    for name, subfields in selected.items():
+        info = model.model_fields[name]
+        annotation = info.annotation
+        if subfields is not None:
+            inner = _inner_model(annotation)
+            if inner is None:
+                raise ValueError(f"{model.__name__}.{name} is not a model")
+            annotation = _replace_model(
+                annotation, inner, projected_model(inner, frozenset(subfields))
+            )
+        definitions[name] = (annotation, info)
+
+    if issubclass(model, HatchingResponse):
+        projection = create_model(
+            f"{model.__name__}Projection", __base__=HatchingResponse, **definitions
+        )
+    else:
+        projection = create_model(
+            f"{model.__name__}Projection", __config__=model.model_config, **definitions
+        )
+    projection.__projection__ = (model, fields)
+    projection.__reduce__ = _reduce_projection
+    return projection
+
+
+def _reduce_projection(self: BaseModel):
+    """Pickle a projected model instance by how to rebuild its class."""
+    return _rebuild_projection, (*type(self).__projection__, self.__getstate__())
+
+
+def _rebuild_projection(
+    model: type[BaseModel], fields: frozenset[str], state: dict
+) -> BaseModel:
+    """Unpickle an instance of ``projected_model(model, fields)``."""
+
+    projection = projected_model(model, fields)
+    obj = projection.__new__(projection)
+    obj.__setstate__(state)
+    return obj
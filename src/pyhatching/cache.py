@@ -0,0 +1,596 @@
+"""Caches used by pyhatching to avoid repeating API requests.
+
+A ``SampleIDCache`` maps file hashes to the sample IDs found for them by
+``PyHatchingClient.sample_id``, so fetching the overview, the sample, and the
+info of the same hash only searches for it once.
+
+``MemorySampleIDCache`` is an in-process LRU cache and is used by default.
+``SqliteSampleIDCache`` stores the mapping in a sqlite file, so it can be shared
+between processes (or survive restarts). Other backends only need to subclass
+``SampleIDCache`` and implement ``_get``, ``_set``, ``clear``, and ``__len__``.
+
+A ``ReportCache`` holds the overview reports of samples whose analysis has
+finished, as those reports no longer change. ``MemoryReportCache`` keeps them
+(compressed by default) in process, ``SqliteReportCache`` stores them
+compressed in a sqlite file and can be read without a client, for example::
+
+    reports = pyhatching.cache.SqliteReportCache("reports.db")
+    report = reports.load(<sample id>)
+
+A ``ValidatorCache`` keeps GET responses that came with an ``ETag`` or
+``Last-Modified`` header, so the client can revalidate them with a conditional
+request and reuse the body when the API answers ``304 Not Modified``.
+"""
+
+import abc
+import collections
+import dataclasses
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Hashable, Iterable
+
+from pydantic import ValidationError  # pylint: disable=E0611
+
+from . import base
+from . import enums
+from . import errors
+
+
+COMPLETE_STATUSES: frozenset[str] = frozenset(s.value for s in enums.CompleteStatuses)
+"""The task statuses after which a report won't change."""
+
+
+class SampleIDCache(abc.ABC):
+    """The interface of a cache of file hash to sample ID lookups.
+
+    Found sample IDs and hashes without a sample (negative results) are cached
+    with separate TTLs, so a hash that is submitted later is picked up soon after.
+    Hashes are case insensitive. Backends must implement ``_get``, ``_set``,
+    ``clear``, and ``__len__``, and set ``blocking`` to False if they're cheap
+    enough to be called on the event loop.
+
+    Parameters
+    ----------
+    ttl : float, optional
+        Seconds a found sample ID is cached for, by default 3600.
+    negative_ttl : float, optional
+        Seconds a hash without a sample is cached for, by default 60.
+        0 disables caching negative results.
+
+    Attributes
+    ----------
+    blocking : bool
+        Whether lookups may block (on disk or network I/O), the client then
+        calls the cache in an executor instead of on the event loop.
+    hits : int
+        The number of lookups answered by the cache, including negative results.
+    misses : int
+        The number of lookups that weren't in the cache (or had expired).
+    """
+
+    blocking = True
+
+    def __init__(self, ttl: float = 3600, negative_ttl: float = 60) -> None:
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, file_hash: str) -> tuple[bool, str | None]:
+        """Look up the sample ID cached for ``file_hash``.
+
+        Returns
+        -------
+        tuple[bool, str | None]
+            Whether the hash was cached, and its sample ID. The sample ID is
+            None for a miss or a cached negative result.
+        """
+
+        found, sample_id = self._get(file_hash.lower(), time.time())
+        if found:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return found, sample_id
+
+    def get_many(self, file_hashes: Iterable[str]) -> dict[str, tuple[bool, str | None]]:
+        """``get`` each of ``file_hashes``, returning the results by hash."""
+
+        return {file_hash: self.get(file_hash) for file_hash in file_hashes}
+
+    def set(self, file_hash: str, sample_id: str | None):
+        """Cache the sample ID (or None if there isn't one) found for ``file_hash``."""
+
+        ttl = self.ttl if sample_id is not None else self.negative_ttl
+        if ttl > 0:
+            self._set(file_hash.lower(), sample_id, time.time() + ttl)
+
+    def set_many(self, sample_ids: dict[str, str | None]):
+        """``set`` the sample ID found for each hash in ``sample_ids``."""
+
+        for file_hash, sample_id in sample_ids.items():
+            self.set(file_hash, sample_id)
+
+    @abc.abstractmethod
+    def _get(self, key: str, now: float) -> tuple[bool, str | None]:
+        """Return whether ``key`` is cached and unexpired at ``now``, and its value."""
+
+    @abc.abstractmethod
+    def _set(self, key: str, sample_id: str | None, expires: float):
+        """Store ``sample_id`` for ``key`` until the ``expires`` timestamp."""
+
+    @abc.abstractmethod
+    def clear(self):
+        """Remove every entry from the cache."""
+
+    @abc.abstractmethod
+    def __len__(self) -> int:
+        """The number of entries in the cache."""
+
+
+class MemorySampleIDCache(SampleIDCache):
+    """An in-process LRU cache of file hash to sample ID lookups.
+
+    Parameters
+    ----------
+    max_size : int, optional
+        The maximum number of hashes held, the least recently used is evicted
+        first. By default 10000. 0 disables the cache.
+    ttl : float, optional
+        Seconds a found sample ID is cached for, by default 3600.
+    negative_ttl : float, optional
+        Seconds a hash without a sample is cached for, by default 60.
+    """
+
+    blocking = False
+
+    def __init__(
+        self, max_size: int = 10000, ttl: float = 3600, negative_ttl: float = 60
+    ) -> None:
+        super().__init__(ttl, negative_ttl)
+        self.max_size = max_size
+        self._entries: collections.OrderedDict[str, tuple[str | None, float]] = (
+            collections.OrderedDict()
+        )
+
+    def _get(self, key: str, now: float) -> tuple[bool, str | None]:
+        try:
+            sample_id, expires = self._entries[key]
+        except KeyError:
+            return False, None
+
+        if expires <= now:
+            del self._entries[key]
+            return False, None
+
+        self._entries.move_to_end(key)
+        return True, sample_id
+
+    def _set(self, key: str, sample_id: str | None, expires: float):
+        if self.max_size <= 0:
+            return
+        self._entries[key] = (sample_id, expires)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SqliteSampleIDCache(SampleIDCache):
+    """A file hash to sample ID cache stored in a sqlite database.
+
+    Several processes can share the same file. Entries are evicted least
+    recently used first once there are more than ``max_size`` of them. An
+    entry's last use is only written when it's older than ``touch_interval``,
+    so most lookups are reads.
+
+    Parameters
+    ----------
+    path : str, optional
+        The path to the sqlite database, created if it doesn't exist.
+        By default ``":memory:"``.
+    max_size : int, optional
+        The maximum number of hashes held, by default 100000.
+    ttl : float, optional
+        Seconds a found sample ID is cached for, by default 3600.
+    negative_ttl : float, optional
+        Seconds a hash without a sample is cached for, by default 60.
+    touch_interval : float, optional
+        Seconds after which a lookup updates an entry's last use, by default 60.
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        max_size: int = 100000,
+        ttl: float = 3600,
+        negative_ttl: float = 60,
+        touch_interval: float = 60,
+    ) -> None:
+        super().__init__(ttl, negative_ttl)
+        self.path = path
+        self.max_size = max_size
+        self.touch_interval = touch_interval
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS sample_ids ("
+                "hash TEXT PRIMARY KEY, sample_id TEXT, expires REAL, used REAL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS sample_ids_used ON sample_ids (used)"
+            )
+
+    def close(self):
+        """Close the database connection."""
+        self._db.close()
+
+    def _get(self, key: str, now: float) -> tuple[bool, str | None]:
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT sample_id, expires, used FROM sample_ids WHERE hash = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return False, None
+
+            if row[1] <= now:
+                self._db.execute("DELETE FROM sample_ids WHERE hash = ?", (key,))
+                return False, None
+
+            if row[2] <= now - self.touch_interval:
+                self._db.execute(
+                    "UPDATE sample_ids SET used = ? WHERE hash = ?", (now, key)
+                )
+            return True, row[0]
+
+    def _set(self, key: str, sample_id: str | None, expires: float):
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO sample_ids VALUES (?, ?, ?, ?)",
+                (key, sample_id, expires, time.time()),
+            )
+            self._db.execute(
+                "DELETE FROM sample_ids WHERE hash IN (SELECT hash FROM sample_ids "
+                "ORDER BY used DESC LIMIT -1 OFFSET ?)",
+                (self.max_size,),
+            )
+
+    def clear(self):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM sample_ids")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM sample_ids").fetchone()[0]
+
+
+class ReportCache(abc.ABC):
+    """The interface of a cache of overview reports by sample ID.
+
+    Reports are stored as the raw JSON body returned by the API. Only
+    reports whose tasks have all reached a ``enums.CompleteStatuses`` status
+    should be cached, see ``is_complete``. Backends must implement ``_get``,
+    ``_set``, ``clear``, and ``__len__``.
+
+    Attributes
+    ----------
+    hits : int
+        The number of lookups answered by the cache.
+    misses : int
+        The number of lookups that weren't in the cache.
+    """
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def is_complete(report: base.OverviewReport) -> bool:
+        """Whether every task in an overview report has finished.
+
+        ``report`` only needs the ``status`` of its ``tasks``, so a projection
+        with ``tasks.status`` works too.
+        """
+
+        tasks = report.tasks or []
+        return bool(tasks) and all(task.status in COMPLETE_STATUSES for task in tasks)
+
+    def get(self, sample_id: str) -> bytes | None:
+        """Return the cached overview report of ``sample_id``, or None."""
+
+        report = self._get(sample_id)
+        if report is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return report
+
+    def load(
+        self, sample_id: str, model: type[base.HatchingResponse] = base.OverviewReport
+    ) -> base.OverviewReport | None:
+        """Return the cached overview report of ``sample_id`` as a model, or None.
+
+        Pass a ``base.projected_model`` of ``OverviewReport`` as ``model`` to only
+        build part of the report.
+
+        Raises
+        ------
+        errors.PyHatchingValidateError
+            If the cached report could not be validated.
+        """
+
+        report = self.get(sample_id)
+        if report is None:
+            return None
+
+        try:
+            return model.model_validate_json(report)
+        except ValidationError as err:
+            raise errors.PyHatchingValidateError(
+                f"Unable to validate the cached report of {sample_id}: {err}"
+            ) from err
+
+    def set(self, sample_id: str, report: bytes):
+        """Cache the overview report of ``sample_id``."""
+        self._set(sample_id, report)
+
+    @abc.abstractmethod
+    def _get(self, sample_id: str) -> bytes | None:
+        """Return the stored report of ``sample_id``, or None."""
+
+    @abc.abstractmethod
+    def _set(self, sample_id: str, report: bytes):
+        """Store the report of ``sample_id``."""
+
+    @abc.abstractmethod
+    def clear(self):
+        """Remove every report from the cache."""
+
+    @abc.abstractmethod
+    def __len__(self) -> int:
+        """The number of reports in the cache."""
+
+
+class MemoryReportCache(ReportCache):
+    """An in-process LRU cache of overview reports.
+
+    Parameters
+    ----------
+    max_bytes : int, optional
+        The most (compressed, if ``compress`` is set) report bytes to keep, the
+        least recently used report is evicted first. By default 128 MiB.
+    compress : bool, optional
+        Keep the reports zlib compressed, by default True. Report JSON
+        compresses several times over, so this holds far more reports in the
+        same memory at the cost of decompressing them on each hit.
+    """
+
+    def __init__(self, max_bytes: int = 2**27, compress: bool = True) -> None:
+        super().__init__()
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self._size = 0
+        self._entries: collections.OrderedDict[str, bytes] = collections.OrderedDict()
+        # The client reads and writes reports from executor threads.
+        self._lock = threading.Lock()
+
+    def get(self, sample_id: str) -> bytes | None:
+        with self._lock:
+            report = super().get(sample_id)
+        if report is not None and self.compress:
+            report = zlib.decompress(report)
+        return report
+
+    def _get(self, sample_id: str) -> bytes | None:
+        report = self._entries.get(sample_id)
+        if report is not None:
+            self._entries.move_to_end(sample_id)
+        return report
+
+    def _set(self, sample_id: str, report: bytes):
+        if self.compress:
+            report = zlib.compress(report)
+
+        with self._lock:
+            old = self._entries.pop(sample_id, None)
+            if old is not None:
+                self._size -= len(old)
+            if len(report) > self.max_bytes:
+                return
+
+            self._entries[sample_id] = report
+            self._size += len(report)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class SqliteReportCache(ReportCache):
+    """Overview reports stored compressed in a sqlite database.
+
+    Several processes can share the same file. Once the compressed reports
+    take up more than ``max_bytes``, the least recently used are evicted.
+
+    Parameters
+    ----------
+    path : str
+        The path to the sqlite database, created if it doesn't exist.
+    max_bytes : int, optional
+        The most compressed report bytes to keep, by default 512 MiB.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 2**29) -> None:
+        super().__init__()
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS reports ("
+                "sample_id TEXT PRIMARY KEY, report BLOB, size INTEGER, used REAL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS reports_used ON reports (used)")
+
+    def close(self):
+        """Close the database connection."""
+        self._db.close()
+
+    def _get(self, sample_id: str) -> bytes | None:
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT report FROM reports WHERE sample_id = ?", (sample_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                "UPDATE reports SET used = ? WHERE sample_id = ?",
+                (time.time(), sample_id),
+            )
+
+        return zlib.decompress(row[0])
+
+    def _set(self, sample_id: str, report: bytes):
+        blob = zlib.compress(report)
+
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO reports VALUES (?, ?, ?, ?)",
+                (sample_id, blob, len(blob), time.time()),
+            )
+            self._db.execute(
+                "DELETE FROM reports WHERE sample_id IN (SELECT sample_id FROM "
+                "(SELECT sample_id, SUM(size) OVER (ORDER BY used DESC) AS total "
+                "FROM reports) WHERE total > ?)",
+                (self.max_bytes,),
+            )
+
+    def clear(self):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM reports")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Validated:
+    """A response kept by ``ValidatorCache`` with its validators."""
+
+    etag: str | None
+    last_modified: str | None
+    meta: base.ResponseMeta
+    body: bytes
+
+
+class ValidatorCache:
+    """An in-process LRU cache of GET responses and their HTTP validators.
+
+    Parameters
+    ----------
+    max_bytes : int, optional
+        The most response body bytes to keep, the least recently used response
+        is evicted first. By default 32 MiB. 0 disables the cache.
+    compress : bool, optional
+        Keep the bodies zlib compressed, trading the time to compress and
+        decompress them for several times less memory. By default False.
+
+    Attributes
+    ----------
+    hits : int
+        The number of ``304 Not Modified`` responses answered from the cache.
+    misses : int
+        The number of full responses received for a conditional request.
+    """
+
+    def __init__(self, max_bytes: int = 2**25, compress: bool = False) -> None:
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.hits = 0
+        self.misses = 0
+        self._size = 0
+        self._entries: collections.OrderedDict[Hashable, Validated] = (
+            collections.OrderedDict()
+        )
+
+    def headers(self, key: Hashable) -> dict[str, str]:
+        """The conditional request headers to send for ``key``, if it's cached."""
+
+        entry = self._entries.get(key)
+        if entry is None:
+            return {}
+
+        headers = {}
+        if entry.etag is not None:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified is not None:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def revalidated(self, key: Hashable) -> Validated | None:
+        """Return the response cached for ``key`` after the API answered 304."""
+
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        if self.compress:
+            return dataclasses.replace(entry, body=zlib.decompress(entry.body))
+        return entry
+
+    def store(
+        self,
+        key: Hashable,
+        etag: str | None,
+        last_modified: str | None,
+        meta: base.ResponseMeta,
+        body: bytes,
+    ):
+        """Cache a full response for ``key``, if it has any validators."""
+
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.misses += 1
+            self._size -= len(old.body)
+
+        if etag is None and last_modified is None:
+            return
+        if self.compress:
+            body = zlib.compress(body)
+        if len(body) > self.max_bytes:
+            return
+
+        self._entries[key] = Validated(etag, last_modified, meta, body)
+        self._size += len(body)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted.body)
+
+    def clear(self):
+        """Remove every response from the cache."""
+        self._entries.clear()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
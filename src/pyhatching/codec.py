@@ -0,0 +1,107 @@
+"""JSON codecs used by pyhatching to decode responses and encode requests.
+
+``default_codec`` picks the fastest installed codec: ``orjson``, then
+``msgspec``, then the standard library's ``json``. Pass a codec to
+``PyHatchingClient`` to choose one explicitly.
+
+Responses that are converted to models are validated straight from their bytes
+by pydantic (see ``pyhatching.convert_body``), the codec is used for everything
+else - request bodies and responses that are only needed as dicts.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover
+    msgspec = None
+
+
+class JsonCodec:
+    """A JSON codec using the standard library's ``json`` module.
+
+    Subclass and override ``loads``, ``dumps``, and ``decode_errors`` to use
+    another JSON library.
+
+    Attributes
+    ----------
+    name : str
+        The name of the JSON library used.
+    decode_errors : tuple[type[Exception], ...]
+        The exceptions ``loads`` raises for invalid JSON.
+    """
+
+    name: str = "json"
+    decode_errors: tuple[type[Exception], ...] = (json.JSONDecodeError,)
+
+    def loads(self, data: str | bytes) -> Any:
+        """Deserialize a JSON document."""
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> str:
+        """Serialize an object to a JSON string."""
+        return json.dumps(obj)
+
+
+class OrjsonCodec(JsonCodec):
+    """A JSON codec using ``orjson``.
+
+    Raises
+    ------
+    ImportError
+        If ``orjson`` is not installed.
+    """
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ImportError("orjson is not installed")
+        self.decode_errors = (orjson.JSONDecodeError,)
+
+    def loads(self, data: str | bytes) -> Any:
+        return orjson.loads(data)
+
+    def dumps(self, obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+
+class MsgspecCodec(JsonCodec):
+    """A JSON codec using ``msgspec``.
+
+    Raises
+    ------
+    ImportError
+        If ``msgspec`` is not installed.
+    """
+
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        if msgspec is None:
+            raise ImportError("msgspec is not installed")
+        self.decode_errors = (msgspec.DecodeError,)
+        self._decoder = msgspec.json.Decoder()
+        self._encoder = msgspec.json.Encoder()
+
+    def loads(self, data: str | bytes) -> Any:
+        return self._decoder.decode(data)
+
+    def dumps(self, obj: Any) -> str:
+        return self._encoder.encode(obj).decode()
+
+
+def default_codec() -> JsonCodec:
+    """Return the fastest installed JSON codec."""
+
+    if orjson is not None:
+        return OrjsonCodec()
+    if msgspec is not None:
+        return MsgspecCodec()
+    return JsonCodec()
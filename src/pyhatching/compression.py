@@ -0,0 +1,97 @@
+"""Content encodings pyhatching negotiates for response bodies.
+
+Reports are large, highly compressible JSON, so the client asks for them
+compressed with every encoding it can decode: ``gzip`` and ``deflate`` always,
+``br`` if ``brotli`` (or ``brotlicffi``) is installed, and ``zstd`` if
+``zstandard`` is installed. Bodies read whole by the client are decoded here,
+so the bytes sent over the wire and the time spent decoding them can be
+recorded on each response's ``base.ResponseMeta``.
+"""
+
+import time
+import zlib
+from typing import Callable
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+
+def _gzip(data: bytes) -> bytes:
+    return zlib.decompress(data, 16 + zlib.MAX_WBITS)
+
+
+def _deflate(data: bytes) -> bytes:
+    # Servers send both zlib wrapped and raw deflate streams as "deflate".
+    try:
+        return zlib.decompress(data)
+    except zlib.error:
+        return zlib.decompress(data, -zlib.MAX_WBITS)
+
+
+def _zstd(data: bytes) -> bytes:
+    # Frames don't always record their size, so decompress as a stream.
+    return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+
+DECODERS: dict[str, Callable[[bytes], bytes]] = {"gzip": _gzip, "deflate": _deflate}
+"""The content encodings that can be decoded, by name, in order of preference."""
+
+if zstandard is not None:
+    DECODERS = {"zstd": _zstd, **DECODERS}
+if brotli is not None:
+    DECODERS = {"br": brotli.decompress, **DECODERS}
+
+
+def accept_encoding() -> str:
+    """The ``Accept-Encoding`` header value listing every decodable encoding."""
+    return ", ".join(DECODERS)
+
+
+def decode(body: bytes, encoding: str | None) -> tuple[bytes, float]:
+    """Decode a body sent with the ``Content-Encoding`` ``encoding``.
+
+    Parameters
+    ----------
+    body : bytes
+        The body as it was sent over the wire.
+    encoding : str | None
+        The ``Content-Encoding`` of the body, None or ``identity`` if it isn't
+        encoded. Several encodings are separated by commas, in the order they
+        were applied.
+
+    Returns
+    -------
+    tuple[bytes, float]
+        The decoded body and the seconds it took to decode.
+
+    Raises
+    ------
+    ValueError
+        If the body uses an encoding that can't be decoded, or is corrupt.
+    """
+
+    start = time.perf_counter()
+    codings = [c.strip().lower() for c in (encoding or "").split(",")]
+    for coding in reversed(codings):
+        if coding in ("", "identity"):
+            continue
+        try:
+            decoder = DECODERS[coding]
+        except KeyError as err:
+            raise ValueError(f"Unsupported content encoding: {coding}") from err
+        try:
+            body = decoder(body)
+        except Exception as err:  # pylint: disable=broad-except
+            raise ValueError(f"Unable to decode the {coding} body: {err}") from err
+
+    return body, time.perf_counter() - start
@@ -10,6 +10,25 @@ class CompleteStatuses(Enum):
     FAILED: str = "failed"
 
 
+class ArtifactKinds(Enum):
+    """Kinds of files produced by analysis that ``download_artifacts`` can fetch."""
+
+    PCAP: str = "pcap"
+    PCAPNG: str = "pcapng"
+    EXTRACTED: str = "extracted"
+    DUMPED: str = "dumped"
+
+
+class EndpointClasses(Enum):
+    """Classes of API endpoints that each get their own rate limit budget."""
+
+    SEARCH: str = "search"
+    REPORT: str = "report"
+    SUBMIT: str = "submit"
+    DOWNLOAD: str = "download"
+    DEFAULT: str = "default"
+
+
 class SubmssionsRequestNetDefaults(Enum):
     """The network default options for a sample submission."""
 
@@ -34,4 +34,11 @@ class PyHatchingJsonError(PyHatchingRequestError):
 
 
 class PyHatchingApiError(PyHatchingConnError):
-    """The Hatching Triage API returned an error."""
+    """The Hatching Triage API returned an error.
+
+    ``response`` is the ``base.ErrorResponse`` the API returned, if it's known.
+    """
+
+    def __init__(self, *args, response=None) -> None:
+        super().__init__(*args)
+        self.response = response
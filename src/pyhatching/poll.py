@@ -0,0 +1,76 @@
+"""Polling schedules for waiting on samples to finish analysis.
+
+A ``PollSchedule`` decides how long to wait before checking a sample's status
+again, based on the status it's in and how many checks in a row it has stayed
+there. Samples early in the queue (``pending``) are checked rarely, samples that
+are almost done (``processing``) often.
+"""
+
+import random
+from typing import Mapping
+
+from . import enums
+
+
+POLL_INTERVALS: dict[enums.SubmissionStatuses, float] = {
+    enums.SubmissionStatuses.PENDING: 30.0,
+    enums.SubmissionStatuses.SCHEDULED: 20.0,
+    enums.SubmissionStatuses.STATIC_ANALYSIS: 15.0,
+    enums.SubmissionStatuses.RUNNING: 10.0,
+    enums.SubmissionStatuses.PROCESSING: 5.0,
+}
+"""The default seconds between status checks of a sample in each status."""
+
+
+class PollSchedule:
+    """How often to check the status of a sample that hasn't finished.
+
+    Parameters
+    ----------
+    intervals : Mapping[enums.SubmissionStatuses, float], optional
+        The seconds to wait after seeing each status, by default POLL_INTERVALS.
+        Statuses without an interval use ``default_interval``.
+    default_interval : float, optional
+        The seconds to wait after any other status, by default 15.
+    backoff : float, optional
+        The factor the interval grows by for each check in a row that saw the
+        same status, by default 1.5.
+    max_interval : float, optional
+        The longest wait between checks, by default 120.
+    jitter : float, optional
+        The fraction of each wait that is randomized, so samples submitted
+        together don't stay in lockstep, by default 0.1.
+    """
+
+    def __init__(
+        self,
+        intervals: Mapping[enums.SubmissionStatuses, float] = POLL_INTERVALS,
+        default_interval: float = 15.0,
+        backoff: float = 1.5,
+        max_interval: float = 120.0,
+        jitter: float = 0.1,
+    ) -> None:
+        if backoff < 1:
+            raise ValueError(f"backoff must be at least 1, not {backoff}")
+
+        self.intervals = dict(intervals)
+        self.default_interval = default_interval
+        self.backoff = backoff
+        self.max_interval = max_interval
+        self.jitter = jitter
+
+    def delay(self, status: enums.SubmissionStatuses, unchanged: int = 0) -> float:
+        """The seconds to wait before checking a sample again.
+
+        Parameters
+        ----------
+        status : enums.SubmissionStatuses
+            The status the sample was last seen in.
+        unchanged : int, optional
+            The number of checks before the last that saw the same status,
+            by default 0.
+        """
+
+        interval = self.intervals.get(status, self.default_interval)
+        interval = min(interval * self.backoff**unchanged, self.max_interval)
+        return interval * random.uniform(1 - self.jitter, 1 + self.jitter)
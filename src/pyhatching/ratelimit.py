@@ -0,0 +1,275 @@
+"""Client-side rate limiting for pyhatching.
+
+A ``RateLimiter`` holds one token bucket per class of endpoint (see
+``enums.EndpointClasses``) and can be shared by any number of ``PyHatchingClient``
+instances in the same process (and event loop) by passing it to each client.
+
+When the API responds with HTTP 429, or reports through its ``X-RateLimit-*``
+headers that a budget is spent, the affected bucket is paused for every
+coroutine using it instead of each caller retrying on its own.
+"""
+
+import asyncio
+import datetime
+import email.utils
+import math
+import time
+from typing import Mapping
+
+from . import enums
+
+
+DEFAULT_429_PAUSE = 1.0
+"""Seconds to pause a bucket after a 429 that didn't say how long to wait."""
+
+
+def endpoint_class(method: str, uri: str) -> enums.EndpointClasses:
+    """Determine the class of endpoint (and so rate limit budget) a request uses.
+
+    Parameters
+    ----------
+    method : str
+        The HTTP method of the request.
+    uri : str
+        The URI of the request, relative to ``API_PATH``.
+
+    Returns
+    -------
+    enums.EndpointClasses
+        The endpoint class of the request.
+    """
+
+    path = uri.split("?", 1)[0].rstrip("/")
+    parts = path.strip("/").split("/")
+
+    if parts[0] == "search":
+        return enums.EndpointClasses.SEARCH
+    if parts[0] == "samples":
+        if len(parts) == 1 and method.lower() == "post":
+            return enums.EndpointClasses.SUBMIT
+        if parts[-1] == "sample":
+            return enums.EndpointClasses.DOWNLOAD
+        # /samples/{id}/{task}/dump.pcap(ng) and /samples/{id}/{task}/files/{name}
+        if len(parts) == 4 and parts[3] in ("dump.pcap", "dump.pcapng"):
+            return enums.EndpointClasses.DOWNLOAD
+        if len(parts) > 4 and parts[3] == "files":
+            return enums.EndpointClasses.DOWNLOAD
+        if len(parts) > 2:
+            return enums.EndpointClasses.REPORT
+
+    return enums.EndpointClasses.DEFAULT
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a ``Retry-After`` header (seconds or an HTTP date) into seconds to wait."""
+
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    now = datetime.datetime.now(tz=when.tzinfo or datetime.timezone.utc)
+    return max((when - now).total_seconds(), 0.0)
+
+
+def parse_rate_limit_reset(value: str | None) -> float | None:
+    """Parse an ``X-RateLimit-Reset`` header into seconds to wait.
+
+    Both a delay in seconds and a unix timestamp are accepted, large values are
+    assumed to be timestamps.
+    """
+
+    if not value:
+        return None
+
+    try:
+        reset = float(value)
+    except ValueError:
+        return None
+
+    if reset > 1e9:
+        reset -= time.time()
+    return max(reset, 0.0)
+
+
+class TokenBucket:
+    """A token bucket that coroutines wait on before making a request.
+
+    Parameters
+    ----------
+    rate : float | None, optional
+        Tokens added per second. None disables the rate limit, though the bucket
+        can still be paused. By default None.
+    burst : int | None, optional
+        The maximum number of tokens the bucket holds, by default ``rate``
+        rounded up (or 1).
+
+    Attributes
+    ----------
+    waits : int
+        The number of ``acquire`` calls that had to wait for a token or a pause.
+    """
+
+    def __init__(self, rate: float | None = None, burst: int | None = None) -> None:
+        if rate is not None and rate <= 0:
+            raise ValueError(f"rate must be positive, not {rate}")
+
+        self.rate = rate
+        self.burst = burst if burst is not None else math.ceil(rate or 1)
+        self.waits = 0
+
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def paused_for(self) -> float:
+        """Seconds until the bucket is no longer paused."""
+        return max(self._paused_until - time.monotonic(), 0.0)
+
+    def _refill(self, now: float):
+        if self.rate is not None:
+            self._tokens = min(
+                self._tokens + max(now - self._updated, 0.0) * self.rate, self.burst
+            )
+        self._updated = now
+
+    async def acquire(self):
+        """Wait until the bucket is not paused and take a token from it."""
+
+        waited = False
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    waited = True
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+
+                if self.rate is None:
+                    break
+
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    break
+
+                waited = True
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+        if waited:
+            self.waits += 1
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens for ``seconds``, then start with an empty bucket."""
+
+        until = time.monotonic() + seconds
+        if until > self._paused_until:
+            self._paused_until = until
+            self._tokens = 0.0
+            self._updated = until
+
+    def update(self, remaining: int | None, reset: float | None):
+        """Sync the bucket with the rate limit state reported by the API.
+
+        Parameters
+        ----------
+        remaining : int | None
+            The number of requests left in the current window.
+        reset : float | None
+            Seconds until the current window resets.
+        """
+
+        if remaining is None:
+            return
+        if remaining <= 0 and reset:
+            self.pause(reset)
+        elif self.rate is not None:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, float(remaining))
+
+
+class RateLimiter:
+    """Token buckets for each class of Hatching Triage API endpoint.
+
+    Parameters
+    ----------
+    budgets : Mapping[enums.EndpointClasses, tuple[float, int | None]], optional
+        The ``(rate, burst)`` budget for each endpoint class, see ``TokenBucket``.
+        Endpoint classes without a budget share the ``DEFAULT`` class' bucket.
+        By default None, every class is unlimited but will still be paused
+        when the API says a rate limit was hit.
+
+    Attributes
+    ----------
+    buckets : dict[enums.EndpointClasses, TokenBucket]
+        The bucket used by each endpoint class.
+    """
+
+    def __init__(
+        self,
+        budgets: Mapping[enums.EndpointClasses, tuple[float, int | None]] | None = None,
+    ) -> None:
+        budgets = dict(budgets or {})
+        default = TokenBucket(*budgets.pop(enums.EndpointClasses.DEFAULT, (None,)))
+
+        self.buckets = {}
+        for endpoint in enums.EndpointClasses:
+            if endpoint in budgets:
+                self.buckets[endpoint] = TokenBucket(*budgets[endpoint])
+            else:
+                self.buckets[endpoint] = default
+
+    async def acquire(self, endpoint: enums.EndpointClasses):
+        """Wait for a token from the bucket of the given endpoint class."""
+        await self.buckets[endpoint].acquire()
+
+    def observe(
+        self,
+        endpoint: enums.EndpointClasses,
+        status: int,
+        headers: Mapping[str, str],
+    ) -> float | None:
+        """Update the endpoint class' bucket from a response's status and headers.
+
+        Parameters
+        ----------
+        endpoint : enums.EndpointClasses
+            The endpoint class the response is from.
+        status : int
+            The HTTP status of the response.
+        headers : Mapping[str, str]
+            The response headers, ``Retry-After`` and ``X-RateLimit-*`` are used.
+
+        Returns
+        -------
+        float | None
+            If ``status`` is 429, the number of seconds the bucket was paused for.
+        """
+
+        bucket = self.buckets[endpoint]
+        reset = parse_rate_limit_reset(headers.get("X-RateLimit-Reset"))
+
+        if status == 429:
+            delay = parse_retry_after(headers.get("Retry-After"))
+            if delay is None:
+                delay = reset if reset is not None else DEFAULT_429_PAUSE
+            bucket.pause(delay)
+            return delay
+
+        try:
+            remaining = int(headers["X-RateLimit-Remaining"])
+        except (KeyError, ValueError):
+            remaining = None
+        bucket.update(remaining, reset)
+
+        return None
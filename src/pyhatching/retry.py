@@ -0,0 +1,126 @@
+"""Retry policies for pyhatching requests.
+
+Idempotent requests (GETs and friends) are retried on transient connection
+errors and server errors. Anything else - most importantly ``POST /samples`` -
+is only retried when the connection failed before the request could be sent,
+so a sample is never submitted twice.
+"""
+
+import asyncio
+import random
+from typing import Iterable
+
+import aiohttp
+
+
+IDEMPOTENT_METHODS: frozenset[str] = frozenset(
+    ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+)
+"""HTTP methods that are safe to send more than once."""
+
+RETRY_STATUSES: frozenset[int] = frozenset((500, 502, 503, 504))
+"""HTTP statuses retried by default."""
+
+RETRY_EXCEPTIONS: tuple[type[BaseException], ...] = (
+    aiohttp.ClientConnectionError,
+    aiohttp.ClientPayloadError,
+    asyncio.TimeoutError,
+)
+"""Exceptions retried by default for idempotent requests."""
+
+PRE_SEND_EXCEPTIONS: tuple[type[BaseException], ...] = (aiohttp.ClientConnectorError,)
+"""Exceptions raised before any of a request was sent, safe to retry for any method."""
+
+
+class RetryPolicy:
+    """When, and after how long, a failed request is sent again.
+
+    Delays use exponential backoff with full jitter: the delay before retry ``n``
+    is a random value between 0 and ``min(max_delay, base_delay * 2 ** (n - 1))``.
+
+    Parameters
+    ----------
+    max_attempts : int, optional
+        The total number of times a request may be sent, by default 3.
+        1 disables retries.
+    base_delay : float, optional
+        The backoff (in seconds) before jitter for the first retry, by default 0.5.
+    max_delay : float, optional
+        The largest backoff (in seconds) before jitter, by default 30.
+    retry_statuses : Iterable[int], optional
+        HTTP statuses that are retried for idempotent methods,
+        by default RETRY_STATUSES.
+    retry_exceptions : Iterable[type[BaseException]], optional
+        Exceptions that are retried for idempotent methods,
+        by default RETRY_EXCEPTIONS.
+    idempotent_methods : Iterable[str], optional
+        HTTP methods that are retried on any of the above,
+        by default IDEMPOTENT_METHODS.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        retry_statuses: Iterable[int] = RETRY_STATUSES,
+        retry_exceptions: Iterable[type[BaseException]] = RETRY_EXCEPTIONS,
+        idempotent_methods: Iterable[str] = IDEMPOTENT_METHODS,
+    ) -> None:
+        if max_attempts < 1:
+            raise ValueError(f"max_attempts must be at least 1, not {max_attempts}")
+
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_exceptions = tuple(retry_exceptions)
+        self.idempotent_methods = frozenset(m.upper() for m in idempotent_methods)
+
+    def is_idempotent(self, method: str) -> bool:
+        """Whether requests using ``method`` are safe to send more than once."""
+        return method.upper() in self.idempotent_methods
+
+    def retry_status(self, method: str, status: int, attempt: int) -> bool:
+        """Whether a response with ``status`` should be retried.
+
+        Parameters
+        ----------
+        method : str
+            The HTTP method of the request.
+        status : int
+            The HTTP status of the response.
+        attempt : int
+            The number of times the request has been retried so far.
+        """
+
+        return (
+            attempt + 1 < self.max_attempts
+            and status in self.retry_statuses
+            and self.is_idempotent(method)
+        )
+
+    def retry_error(self, method: str, err: BaseException, attempt: int) -> bool:
+        """Whether a request that raised ``err`` should be retried.
+
+        Parameters
+        ----------
+        method : str
+            The HTTP method of the request.
+        err : BaseException
+            The exception raised while making the request.
+        attempt : int
+            The number of times the request has been retried so far.
+        """
+
+        if attempt + 1 >= self.max_attempts:
+            return False
+        if isinstance(err, PRE_SEND_EXCEPTIONS):
+            return True
+        return self.is_idempotent(method) and isinstance(err, self.retry_exceptions)
+
+    def delay(self, attempt: int) -> float:
+        """The number of seconds to wait before retry number ``attempt`` (from 1)."""
+
+        backoff = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, backoff)
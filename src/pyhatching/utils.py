@@ -1,6 +1,21 @@
 """Pyhatching helper functions."""
 
+import asyncio
+import functools
+import hashlib
+import os
 import re
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    BinaryIO,
+    Callable,
+    Hashable,
+    Iterable,
+    Iterator,
+)
 
 from . import enums
 
@@ -51,3 +66,298 @@ def hash_type(input_hash: str) -> enums.HashPrefixes | None:
         return enums.HashPrefixes.MD5.value
 
     return None
+
+
+def pack_terms(terms: Iterable[str], sep: str, max_length: int) -> Iterator[list[str]]:
+    """Group ``terms`` so each group joined by ``sep`` is at most ``max_length`` long.
+
+    A single term longer than ``max_length`` is put in a group on its own.
+
+    Parameters
+    ----------
+    terms : Iterable[str]
+        The terms to group, their order is kept.
+    sep : str
+        The separator the terms of a group will be joined with.
+    max_length : int
+        The longest a joined group may be.
+
+    Yields
+    ------
+    list[str]
+        Each group of terms.
+    """
+
+    group = []
+    length = 0
+    for term in terms:
+        added = len(term) + (len(sep) if group else 0)
+        if group and length + added > max_length:
+            yield group
+            group = []
+            added = len(term)
+            length = 0
+        group.append(term)
+        length += added
+
+    if group:
+        yield group
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    """Split a stream of byte chunks into lines, without their line endings.
+
+    Only the current line (and the rest of its chunk) is held in memory, however
+    long the stream. Blank lines are skipped.
+
+    Parameters
+    ----------
+    chunks : AsyncIterable[bytes]
+        The chunks of the stream, for example ``resp.content.iter_chunked(n)``.
+
+    Yields
+    ------
+    bytes
+        Each non blank line.
+    """
+
+    partial = b""
+    async for chunk in chunks:
+        lines = (partial + chunk).split(b"\n")
+        partial = lines.pop()
+        for line in lines:
+            if line.strip():
+                yield line
+
+    if partial.strip():
+        yield partial
+
+
+async def aiter_items(items: Iterable | AsyncIterable) -> AsyncIterator:
+    """Yield from either a sync or async iterable."""
+
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+async def bounded_as_completed(
+    func: Callable[[Any], Awaitable],
+    items: Iterable | AsyncIterable,
+    concurrency: int,
+) -> AsyncIterator:
+    """Await ``func(item)`` for each item with at most ``concurrency`` running at once.
+
+    Results are yielded in the order they complete. Items are only pulled from
+    ``items`` when there's a free slot, so neither the inputs nor the results of
+    a large batch are ever held in memory all at once. Exceptions raised by
+    ``func`` propagate, so ``func`` should capture any it wants to survive.
+
+    Closing the returned generator early cancels any calls still in flight.
+
+    Parameters
+    ----------
+    func : Callable[[Any], Awaitable]
+        The coroutine function to call with each item.
+    items : Iterable | AsyncIterable
+        The items to pass to ``func``.
+    concurrency : int
+        The maximum number of ``func`` calls awaited at once.
+
+    Yields
+    ------
+    Any
+        The result of each ``func`` call, in completion order.
+
+    Raises
+    ------
+    ValueError
+        If ``concurrency`` is less than 1.
+    """
+
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be a positive integer, not {concurrency}")
+
+    inputs = aiter_items(items)
+    exhausted = False
+    pending = set()
+
+    try:
+        while True:
+            while not exhausted and len(pending) < concurrency:
+                try:
+                    item = await anext(inputs)
+                except StopAsyncIteration:
+                    exhausted = True
+                else:
+                    pending.add(asyncio.create_task(func(item)))
+
+            if not pending:
+                return
+
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        await inputs.aclose()
+
+
+class HashingChunkReader:
+    """Asynchronously read a file or bytes in chunks, hashing them as they're read.
+
+    Used as an ``aiohttp`` payload so uploads are streamed without holding a full
+    copy of the file in memory. File reads happen in the default executor so
+    they don't block the event loop. The hashes are complete once the reader
+    has been fully iterated, and are reset if it is iterated again.
+
+    Use as a context manager (or call ``close``) to close a file opened by path.
+
+    Parameters
+    ----------
+    source : bytes | str | os.PathLike
+        The raw bytes or path of the file to read.
+    chunk_size : int, optional
+        The maximum number of bytes to read at a time, by default 2**16.
+
+    Attributes
+    ----------
+    size : int
+        The number of bytes read so far.
+
+    Raises
+    ------
+    OSError
+        If ``source`` is a path that cannot be opened.
+    """
+
+    def __init__(
+        self, source: bytes | str | os.PathLike, chunk_size: int = 2**16
+    ) -> None:
+        self.chunk_size = chunk_size
+        self.size = 0
+        self._md5 = hashlib.md5()
+        self._sha256 = hashlib.sha256()
+
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            self._view = memoryview(source)
+            self._fd: BinaryIO | None = None
+        else:
+            self._view = None
+            self._fd = open(source, "rb")  # pylint: disable=consider-using-with
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Close the underlying file, if one was opened."""
+        if self._fd is not None:
+            self._fd.close()
+
+    @property
+    def md5(self) -> str:
+        """The md5 hex digest of the bytes read so far."""
+        return self._md5.hexdigest()
+
+    @property
+    def sha256(self) -> str:
+        """The sha256 hex digest of the bytes read so far."""
+        return self._sha256.hexdigest()
+
+    async def _chunks(self) -> AsyncIterator[bytes | memoryview]:
+        """Yield the raw chunks of the source."""
+
+        if self._view is not None:
+            for start in range(0, len(self._view), self.chunk_size):
+                yield self._view[start : start + self.chunk_size]
+            return
+
+        loop = asyncio.get_running_loop()
+        self._fd.seek(0)
+        while chunk := await loop.run_in_executor(
+            None, self._fd.read, self.chunk_size
+        ):
+            yield chunk
+
+    async def __aiter__(self) -> AsyncIterator[bytes | memoryview]:
+        self.size = 0
+        self._md5 = hashlib.md5()
+        self._sha256 = hashlib.sha256()
+
+        async for chunk in self._chunks():
+            self._md5.update(chunk)
+            self._sha256.update(chunk)
+            self.size += len(chunk)
+            yield chunk
+
+
+class SingleFlight:
+    """Share one call of a coroutine function between concurrent callers.
+
+    While a call for a key is in flight, callers asking for the same key wait
+    on it and get the same result (or exception) instead of making their own.
+    Once it finishes, the next caller starts a new call - results aren't cached.
+
+    A caller that's cancelled only cancels the shared call if no other caller
+    is still waiting on it.
+
+    Attributes
+    ----------
+    calls : int
+        The number of calls made.
+    coalesced : int
+        The number of callers that waited on another's call instead of making one.
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.coalesced = 0
+        # The call in flight for each key, and how many callers are waiting on it.
+        self._in_flight: dict[Hashable, list] = {}
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable]) -> Any:
+        """Await ``func()``, or the call already in flight for ``key``."""
+
+        flight = self._in_flight.get(key)
+        if flight is None:
+            self.calls += 1
+            call = asyncio.ensure_future(func())
+            flight = self._in_flight[key] = [call, 0]
+            call.add_done_callback(functools.partial(self._done, key))
+        else:
+            self.coalesced += 1
+
+        call = flight[0]
+        flight[1] += 1
+        try:
+            return await asyncio.shield(call)
+        except asyncio.CancelledError:
+            if flight[1] == 1 and not call.done():
+                # Don't let new callers join the call while it winds down.
+                if self._in_flight.get(key) is flight:
+                    del self._in_flight[key]
+                call.cancel()
+            raise
+        finally:
+            flight[1] -= 1
+
+    def _done(self, key: Hashable, call: asyncio.Future):
+        flight = self._in_flight.get(key)
+        if flight is not None and flight[0] is call:
+            del self._in_flight[key]
+        # Every caller may have been cancelled, don't warn about an unread error.
+        if not call.cancelled():
+            call.exception()